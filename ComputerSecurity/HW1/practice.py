@@ -1,4 +1,13 @@
+import argparse
+import codecs
+import os
 import random
+import stat
+import sys
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def generate_key():
@@ -54,10 +63,246 @@ def decrypt_vigenere_enhanced(ciphertext):
     return plaintext.lower()
 
 
+# ---------------------------------------------------------------------------
+# Vectorized versions.
+#
+# With x = key + PLAINTEXT, the recurrence y[i] = (y[i-17] + x[i] - 65) % 26 adds up
+# every 17th letter, so laid out as rows of 17, y is a cumulative sum down each
+# column (mod 26). The key shift has period 17 too: it is one row added to every row.
+# A batch of messages is one array of rows, each message padded to whole rows and
+# the cumulative sums restarted at the first row of every message.
+# Decryption takes y[i] - y[i-17] over the whole batch at once.
+# ---------------------------------------------------------------------------
 
-plaintext = "Hello World"
-ciphertext = encrypt_vigenere_enhanced(plaintext)
-print("Encrypted message:", ciphertext)
+def _codes(text):
+    """Code points of text as a NumPy array (uint8 when text is ASCII)."""
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
 
-decrypted_text = decrypt_vigenere_enhanced(ciphertext)
-print("Decrypted message:", decrypted_text)
+
+def _letters(values, base):
+    """String of chr(v + base) for an array of values in [0, 26)."""
+    return (values + base).astype(np.uint8).tobytes().decode('ascii')
+
+
+def _split(text, lengths):
+    pieces = []
+    start = 0
+    for length in lengths:
+        pieces.append(text[start:start + length])
+        start += length
+    return pieces
+
+
+def encrypt_many(plaintexts, keys=None):
+    """
+    Encrypts every plaintext like encrypt_vigenere_enhanced.
+    keys: one 17-letter key per message; by default each is drawn with generate_key(),
+    in order, so with the same random state the output equals the per-message function.
+    """
+    if np is None:
+        raise ImportError('numpy is required for encrypt_many')
+    messages = [text.upper() for text in plaintexts]
+    if keys is None:
+        keys = [generate_key() for _ in messages]
+    keys = list(keys)
+    if len(keys) != len(messages):
+        raise ValueError('one key per message is needed')
+    if not messages:
+        return []
+    if any(len(key) != 17 for key in keys):
+        raise ValueError('keys must have 17 letters')
+
+    lengths = [17 + len(text) for text in messages]
+    rows = [-(-length // 17) for length in lengths]         # rows of 17 per message
+    # pad every x = key + text to whole rows; the padding is cut off again at the end
+    padded = ''.join(key + text + '\0' * (17 * r - length)
+                     for key, text, r, length in zip(keys, messages, rows, lengths))
+    d = ((_codes(padded).astype(np.int64) - 65) % 26).reshape(-1, 17)
+
+    # cumulative sum down the columns, restarted at the first row of every message
+    total = np.cumsum(d, axis=0)
+    first_row = np.cumsum(rows) - rows
+    before = np.zeros((len(rows), 17), dtype=np.int64)
+    before[1:] = total[first_row[1:] - 1]
+    y = total - np.repeat(before, rows, axis=0)
+
+    shift = (_codes(''.join(keys)).astype(np.int64) - 65).reshape(-1, 17)
+    c = (y + np.repeat(shift, rows, axis=0)) % 26
+    ciphertext = _letters(c.ravel(), 65)
+    return [ciphertext[17 * row:17 * row + length] for row, length in zip(first_row.tolist(), lengths)]
+
+
+def decrypt_many(ciphertexts, keys=None):
+    """
+    Decrypts every ciphertext.
+    Without keys this is exactly decrypt_vigenere_enhanced: the first len % 17
+    letters are taken as the key. With the 17-letter keys used by encrypt_many it is
+    the inverse of the encryption (for plaintexts made of letters only).
+    """
+    if np is None:
+        raise ImportError('numpy is required for decrypt_many')
+    ciphertexts = list(ciphertexts)
+    if keys is None:
+        keys = [text[:len(text) % 17] for text in ciphertexts]
+        bodies = [text[len(key):] for text, key in zip(ciphertexts, keys)]
+    else:
+        keys = list(keys)
+        if len(keys) != len(ciphertexts):
+            raise ValueError('one key per message is needed')
+        bodies = ciphertexts
+    if any(body and not key for body, key in zip(bodies, keys)):
+        raise ValueError('ciphertext has no key letters (its length is a multiple of 17)')
+    body_lengths = [len(body) for body in bodies]
+    key_lengths = [len(key) for key in keys]
+    if sum(body_lengths) == 0:
+        return ['' for _ in bodies]
+
+    body = _codes(''.join(bodies)).astype(np.int64)
+    key = _codes(''.join(keys)).astype(np.int64)
+    offset = np.arange(len(body)) - np.repeat(np.cumsum(body_lengths) - body_lengths, body_lengths)
+    key_start = np.repeat(np.cumsum(key_lengths) - key_lengths, body_lengths)
+    key_length = np.repeat(np.maximum(key_lengths, 1), body_lengths)
+    y = (body - key[key_start + offset % key_length]) % 26
+
+    # x[i] = y[i] - y[i-17] for the letters after the first 17 of each message
+    keep = np.nonzero(offset >= 17)[0]
+    x = (y[keep] - y[keep - 17]) % 26
+    return _split(_letters(x, 97), [max(length - 17, 0) for length in body_lengths])
+
+
+# ---------------------------------------------------------------------------
+# Streaming versions, in constant memory.
+#
+# Encryption only has to carry y's column sums (the last y of each of the 17
+# columns) and the position mod 17 from one chunk to the next. Decryption carries
+# the last 17 values of y and the position in the key. Chunks can be str or bytes
+# (decoded as UTF-8, also when a character is split between two chunks), or a file
+# object, which is read chunk_size at a time.
+# ---------------------------------------------------------------------------
+
+def _text_chunks(source, chunk_size):
+    if hasattr(source, 'read'):
+        file = source
+        source = iter(lambda: file.read(chunk_size), file.read(0))
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in source:
+        text = decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def encrypt_stream(source, key=None, chunk_size=1 << 20):
+    """
+    Generates the ciphertext of the text in source chunk by chunk.
+    The concatenated output equals encrypt_vigenere_enhanced(whole text) with the same
+    key (drawn with generate_key() when not given).
+    """
+    if np is None:
+        raise ImportError('numpy is required for encrypt_stream')
+    if key is None:
+        key = generate_key()
+    if len(key) != 17:
+        raise ValueError('key must have 17 letters')
+    shift = (_codes(key).astype(np.int64) - 65) % 26
+    column_sums = shift.copy()          # y of the key letters x[0..16]
+    yield _letters((column_sums + shift) % 26, 65)
+    position = 17
+    for text in _text_chunks(source, chunk_size):
+        d = (_codes(text.upper()).astype(np.int64) - 65) % 26
+        start = position % 17
+        rows = -(-(start + len(d)) // 17)
+        block = np.zeros(17 * rows, dtype=np.int64)     # zeros do not change the sums
+        block[start:start + len(d)] = d
+        y = (np.cumsum(block.reshape(rows, 17), axis=0) + column_sums) % 26
+        column_sums = y[-1].copy()
+        c = (y + shift) % 26
+        yield _letters(c.ravel()[start:start + len(d)], 65)
+        position += len(d)
+
+
+def decrypt_stream(source, key=None, length=None, chunk_size=1 << 20):
+    """
+    Generates the plaintext of the ciphertext in source chunk by chunk.
+    With the 17-letter key this inverts encrypt_stream. Without it, the output equals
+    decrypt_vigenere_enhanced(whole ciphertext), which takes the first len % 17
+    letters as the key, so the total length has to be given.
+    """
+    if np is None:
+        raise ImportError('numpy is required for decrypt_stream')
+    if key is None:
+        if length is None:
+            raise ValueError('length of the ciphertext is needed when no key is given')
+        key_length = length % 17
+    else:
+        key_length = len(key)
+    key_codes = None if key is None else _codes(key).astype(np.int64)
+    prefix = ''
+    offset = 0                                  # position in the body (after the key letters)
+    previous = np.zeros(0, dtype=np.int64)      # the last (up to) 17 values of y
+    seen = 0
+    for text in _text_chunks(source, chunk_size):
+        seen += len(text)
+        if key_codes is None:
+            prefix += text
+            if len(prefix) < key_length:
+                continue
+            key_codes = _codes(prefix[:key_length]).astype(np.int64)
+            text = prefix[key_length:]
+            prefix = ''
+        if not text:
+            continue
+        if key_length == 0:
+            raise ValueError('ciphertext has no key letters (its length is a multiple of 17)')
+        c = _codes(text).astype(np.int64)
+        y = (c - key_codes[(offset + np.arange(len(c))) % key_length]) % 26
+        y = np.concatenate((previous, y))
+        yield _letters((y[17:] - y[:-17]) % 26, 97)
+        previous = y[-17:]
+        offset += len(c)
+    if key is None and seen != length:
+        raise ValueError(f'ciphertext has {seen} letters, not {length}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Enhanced Vigenere cipher, streamed from stdin to stdout')
+    parser.add_argument('mode', choices=('encrypt', 'decrypt'))
+    parser.add_argument('--key', help='17-letter key (encrypt: generated and printed to stderr if omitted)')
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help='bytes read at a time')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin.buffer
+    if args.mode == 'encrypt':
+        key = args.key
+        if key is None:
+            key = generate_key()
+            print('key:', key, file=sys.stderr)
+        pieces = encrypt_stream(source, key, args.chunk_size)
+    else:
+        length = None
+        if args.key is None:
+            # decrypting without the key needs the total length: take the size of a redirected file
+            info = os.fstat(source.fileno())
+            if not stat.S_ISREG(info.st_mode):
+                parser.error('decrypt without --key needs stdin redirected from a file')
+            length = info.st_size
+        pieces = decrypt_stream(source, args.key, length, args.chunk_size)
+    for piece in pieces:
+        sys.stdout.buffer.write(piece.encode('ascii'))
+    sys.stdout.buffer.flush()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main()
+    else:
+        plaintext = "Hello World"
+        ciphertext = encrypt_vigenere_enhanced(plaintext)
+        print("Encrypted message:", ciphertext)
+
+        decrypted_text = decrypt_vigenere_enhanced(ciphertext)
+        print("Decrypted message:", decrypted_text)
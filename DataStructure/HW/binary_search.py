@@ -0,0 +1,114 @@
+"""Index-based binary search on sorted sequences.
+
+Every search works on index bounds [lo, hi) of the original sequence, so nothing
+is copied and no recursion is needed: a lookup is O(log n).
+
+    search(a, x)          index of x in a, or -1
+    lower_bound(a, x)     first index i with a[i] >= x
+    upper_bound(a, x)     first index i with a[i] > x
+    search_many(a, xs)    search() for every query at once
+"""
+from bisect import bisect_left, bisect_right
+import random
+import time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def lower_bound(a, x, lo=0, hi=None):
+    """Return the first index i in [lo, hi) with a[i] >= x (hi if there is none)."""
+    return bisect_left(a, x, lo, len(a) if hi is None else hi)
+
+
+def upper_bound(a, x, lo=0, hi=None):
+    """Return the first index i in [lo, hi) with a[i] > x (hi if there is none)."""
+    return bisect_right(a, x, lo, len(a) if hi is None else hi)
+
+
+def search(a, x, lo=0, hi=None):
+    """Return the index of (the first) x in a[lo:hi], or -1."""
+    if hi is None:
+        hi = len(a)
+    i = bisect_left(a, x, lo, hi)
+    return i if i < hi and a[i] == x else -1
+
+
+def search_many(a, queries):
+    """Return search(a, q) for every query.
+
+    NumPy arrays go through one vectorized numpy.searchsorted call and give an
+    array back. For lists, sorted queries are merged with a in a single pass when
+    that is cheaper than a binary search per query; otherwise each query is
+    binary searched. Either way the result is a list of indices (-1 = missing).
+    """
+    if np is not None and (isinstance(a, np.ndarray) or isinstance(queries, np.ndarray)):
+        a = np.asarray(a)
+        queries = np.asarray(queries)
+        positions = np.searchsorted(a, queries, side='left')
+        inside = positions < len(a)
+        found = np.zeros(len(queries), dtype=bool)
+        found[inside] = a[positions[inside]] == queries[inside]
+        return np.where(found, positions, -1)
+
+    queries = list(queries)
+    n = len(a)
+    m = len(queries)
+    is_sorted = all(queries[i] <= queries[i+1] for i in range(m - 1))
+    if is_sorted and n < m * max(n.bit_length(), 1):
+        return _merge_search(a, queries)
+    return [search(a, x) for x in queries]
+
+
+def _merge_search(a, queries):
+    # Both sequences sorted: walk them together, O(n + m)
+    results = []
+    i = 0
+    n = len(a)
+    for x in queries:
+        while i < n and a[i] < x:
+            i += 1
+        results.append(i if i < n and a[i] == x else -1)
+    return results
+
+
+#-------------------------- benchmark --------------------------
+def benchmark(sizes=(10**3, 10**4, 10**5, 10**6, 10**7), queries=1000, seed=0):
+    """Compare hw1.binarySearch_1 with search / search_many; prints microseconds per query.
+
+    binarySearch_1 copies half of the list at every level, so it only gets a
+    few queries on the large sizes.
+    """
+    import hw1
+    rng = random.Random(seed)
+    print(f'{"n":>10s} {"binarySearch_1":>16s} {"search":>10s} {"search_many":>12s} {"searchsorted":>13s}   (us/query)')
+    for n in sizes:
+        a = list(range(0, 2 * n, 2))
+        xs = [rng.randrange(2 * n) for _ in range(queries)]
+        present = [x - x % 2 for x in xs]       # binarySearch_1 needs values that are in the list
+
+        slow = present[:max(10, min(queries, 10**6 // n))]
+        start = time.perf_counter()
+        for x in slow:
+            hw1.binarySearch_1(a, x)
+        recursive = (time.perf_counter() - start) / len(slow)
+
+        start = time.perf_counter()
+        for x in xs:
+            search(a, x)
+        single = (time.perf_counter() - start) / queries
+
+        xs.sort()
+        start = time.perf_counter()
+        search_many(a, xs)
+        batched = (time.perf_counter() - start) / queries
+
+        line = f'{n:>10d} {recursive * 1e6:>16.2f} {single * 1e6:>10.2f} {batched * 1e6:>12.2f}'
+        if np is not None:
+            array = np.array(a)
+            query_array = np.array(xs)
+            start = time.perf_counter()
+            search_many(array, query_array)
+            line += f' {(time.perf_counter() - start) / queries * 1e6:>13.3f}'
+        print(line)
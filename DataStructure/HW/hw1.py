@@ -15,6 +15,16 @@ def binarySearch_1(list_in: list, value, offset=0):
     
 
 def binarySearch_2(list_in, value, offset, length):
-    # FILL IN HERE
-    return 0 
+    # Search list_in[offset:offset+length] by moving the bounds: no slicing, no recursion
+    lo = offset
+    hi = offset + length
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if list_in[mid] == value:
+            return mid
+        elif list_in[mid] > value:
+            hi = mid
+        else:
+            lo = mid + 1
+    return -1
 
@@ -1,6 +1,17 @@
+import sys
+
+import binary_search
 import hw1
 
 sorted_list = [3, 5, 8, 11, 12, 13, 15, 19, 30, 35]
 
 for val in sorted_list:
-    print(hw1.binarySearch_1(sorted_list, val))
\ No newline at end of file
+    print(hw1.binarySearch_1(sorted_list, val))
+
+# python main.py benchmark [sizes ...]   e.g. python main.py benchmark 1e3 1e5 1e7
+if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+    sizes = [int(float(size)) for size in sys.argv[2:]]
+    if sizes:
+        binary_search.benchmark(sizes)
+    else:
+        binary_search.benchmark()
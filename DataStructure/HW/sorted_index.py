@@ -0,0 +1,146 @@
+"""Read-only sorted index in Eytzinger (BFS) layout.
+
+The sorted keys are stored as an implicit complete binary search tree: node k
+has children 2k and 2k+1, and the root is k = 1. A search always touches k, 2k
+or 2k+1, ..., so the first levels of the tree stay in cache. Every query in a
+batch takes the same number of steps, which lets NumPy descend all of them at
+once:
+
+    k = 2*k + (tree[k] < x)
+
+Afterwards, the last left turn (the lowest zero bit of k) is the lower bound.
+"""
+from bisect import bisect_left
+import random
+import time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SortedIndex:
+    """Immutable index over a sorted sequence, answering batches of lookups."""
+
+    def __init__(self, sorted_keys, dtype=None):
+        if np is None:
+            raise ImportError('numpy is required for SortedIndex')
+        keys = np.asarray(sorted_keys, dtype=dtype)
+        if keys.ndim != 1:
+            raise ValueError('keys must be one-dimensional')
+        if len(keys) > 1 and np.any(keys[1:] < keys[:-1]):
+            raise ValueError('keys must be sorted')
+        n = len(keys)
+        self._n = n
+        self._levels = n.bit_length()               # depth of the deepest node, plus one
+        # In-order walk of the implicit tree: rank[k] = sorted position of node k
+        rank = np.full(1 << (self._levels + 1), n, dtype=np.int64)  # node 0 and padding: "past the end"
+        position = 0
+        stack = []
+        k = 1
+        while stack or k <= n:
+            if k <= n:
+                stack.append(k)
+                k = 2 * k
+            else:
+                k = stack.pop()
+                rank[k] = position
+                position += 1
+                k = 2 * k + 1
+        self._rank = rank
+        tree = np.zeros(len(rank), dtype=keys.dtype)
+        tree[1:n+1] = keys[rank[1:n+1]]
+        self._tree = tree
+
+    def __len__(self):
+        return self._n
+
+    def lower_bound_many(self, queries):
+        """First sorted position i with key[i] >= q, for every query (an int64 array)."""
+        queries = np.asarray(queries)
+        tree = self._tree
+        n = self._n
+        k = np.ones(len(queries), dtype=np.int64)
+        for _ in range(self._levels):
+            # Going right past the last node (k > n) keeps the last real left turn as the answer
+            k = 2 * k + ((tree[k] < queries) | (k > n))
+        lowest_zero = ~k & (k + 1)
+        k //= 2 * lowest_zero                       # back to the node of the last left turn
+        return self._rank[k]
+
+    def upper_bound_many(self, queries):
+        """First sorted position i with key[i] > q, for every query."""
+        queries = np.asarray(queries)
+        tree = self._tree
+        n = self._n
+        k = np.ones(len(queries), dtype=np.int64)
+        for _ in range(self._levels):
+            k = 2 * k + ((tree[k] <= queries) | (k > n))
+        lowest_zero = ~k & (k + 1)
+        k //= 2 * lowest_zero
+        return self._rank[k]
+
+    def search_many(self, queries):
+        """Sorted position of every query, or -1 where the key is missing."""
+        queries = np.asarray(queries)
+        positions = self.lower_bound_many(queries)
+        keys = self._sorted_keys()
+        found = positions < self._n
+        found[found] = keys[positions[found]] == queries[found]
+        return np.where(found, positions, -1)
+
+    def contains_many(self, queries):
+        return self.search_many(queries) != -1
+
+    def count_range_many(self, lo, hi):
+        """Number of keys in [lo[i], hi[i]) for every i."""
+        return np.maximum(self.lower_bound_many(hi) - self.lower_bound_many(lo), 0)
+
+    def range(self, lo, hi):
+        """Keys in [lo, hi), as an array."""
+        start, stop = self.lower_bound_many([lo, hi])
+        return self._sorted_keys()[start:stop]
+
+    def _sorted_keys(self):
+        # The keys in sorted order, only built when a query needs them
+        keys = getattr(self, '_keys', None)
+        if keys is None:
+            keys = np.empty(self._n, dtype=self._tree.dtype)
+            keys[self._rank[1:self._n+1]] = self._tree[1:self._n+1]
+            self._keys = keys
+        return keys
+
+
+#-------------------------- benchmark --------------------------
+def benchmark(sizes=(10**6, 10**7), queries=10**6, seed=0):
+    """Batched lower bounds: bisect loop vs numpy.searchsorted vs SortedIndex (ns/query)."""
+    rng = random.Random(seed)
+    print(f'{"n":>10s} {"bisect":>10s} {"searchsorted":>13s} {"SortedIndex":>12s} {"build (s)":>10s}')
+    for n in sizes:
+        keys = list(range(0, 2 * n, 2))
+        xs = [rng.randrange(2 * n) for _ in range(queries)]
+
+        start = time.perf_counter()
+        expected = [bisect_left(keys, x) for x in xs]
+        with_bisect = time.perf_counter() - start
+
+        array = np.array(keys, dtype=np.int64)
+        query_array = np.array(xs, dtype=np.int64)
+        start = time.perf_counter()
+        np.searchsorted(array, query_array)
+        with_searchsorted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = SortedIndex(array)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        result = index.lower_bound_many(query_array)
+        with_index = time.perf_counter() - start
+        assert result.tolist() == expected
+
+        print(f'{n:>10d} {with_bisect / queries * 1e9:>10.1f} {with_searchsorted / queries * 1e9:>13.1f} '
+              f'{with_index / queries * 1e9:>12.1f} {build:>10.2f}')
+
+
+if __name__ == '__main__':
+    benchmark()
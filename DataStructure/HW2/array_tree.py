@@ -0,0 +1,254 @@
+from array import array
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from tree import Tree
+
+class ArrayTree(Tree):
+    """Array-based representation of a general tree structure.
+
+    Node i is just an int: its parent, first child, last child, next sibling and
+    number of children live at index i of flat arrays, and its element at index i
+    of a list. There is one interned Position per node, so traversals allocate
+    nothing. Nodes can be added but not deleted.
+    """
+    NIL = -1                    # id used for "no node"
+
+    #-------------------------- nested Position class --------------------------
+    class Position(Tree.Position):
+        """An abstraction representing the location of a single element."""
+        __slots__ = '_container', '_index'
+
+        def __init__(self, container, index):
+            """Constructor should not be invoked by user."""
+            self._container = container
+            self._index = index
+
+        def element(self):
+            """Return the element stored at this Position."""
+            return self._container._element[self._index]
+
+        def __eq__(self, other):
+            """Return True if other is a Position representing the same location."""
+            return type(other) is type(self) and other._container is self._container and other._index == self._index
+
+        def __hash__(self):
+            return hash(self._index)
+
+    #------------------------------- utility methods -------------------------------
+    def _validate(self, p):
+        """Return associated node id, if position is valid."""
+        if not isinstance(p, self.Position):
+            raise TypeError('p must be proper Position type')
+        if p._container is not self:
+            raise ValueError('p does not belong to this container')
+        return p._index
+
+    def _make_position(self, index):
+        """Return the Position of node id (or None if NIL)."""
+        return self._positions[index] if index != -1 else None
+
+    #-------------------------- Tree constructor --------------------------
+    def __init__(self):
+        """Create an initially empty tree."""
+        self._element = []
+        self._parent = array('q')
+        self._first_child = array('q')
+        self._last_child = array('q')     # children are appended in O(1)
+        self._next_sibling = array('q')
+        self._num_children = array('q')
+        self._positions = []
+        self._root = self.NIL
+
+    # Build a tree from (id, parent_id) pairs in O(n); the root's parent_id is None.
+    # ids can be any hashable values; node elements are the ids, unless `elements`
+    # maps ids to elements. Children keep the order in which their edges appear.
+    @classmethod
+    def from_edges(cls, edges, elements=None):
+        tree = cls()
+        ids = []
+        parent_ids = []
+        for node_id, parent_id in edges:
+            ids.append(node_id)
+            parent_ids.append(parent_id)
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        if len(index) != len(ids):
+            raise ValueError('duplicate id')
+        n = len(ids)
+        tree._element = ids if elements is None else [elements[node_id] for node_id in ids]
+        tree._first_child = array('q', [-1]) * n
+        tree._last_child = array('q', [-1]) * n
+        tree._next_sibling = array('q', [-1]) * n
+        tree._num_children = array('q', [0]) * n
+        tree._positions = [cls.Position(tree, i) for i in range(n)]
+        parents = array('q', [-1]) * n
+        for i, parent_id in enumerate(parent_ids):
+            if parent_id is None:
+                if tree._root != -1:
+                    raise ValueError('more than one root')
+                tree._root = i
+                continue
+            try:
+                parent = index[parent_id]
+            except KeyError:
+                raise ValueError(f'unknown parent id: {parent_id!r}') from None
+            parents[i] = parent
+            tree._link(parent, i)
+        tree._parent = parents
+        if n and tree._root == -1:
+            raise ValueError('no root')
+        if n and sum(1 for _ in tree._preorder_ids(tree._root)) != n:
+            raise ValueError('edges contain a cycle')
+        return tree
+
+    #-------------------------- public accessors --------------------------
+    def root(self):
+        """Return the root Position of the tree (or None if tree is empty)."""
+        return self._make_position(self._root)
+
+    def parent(self, p):
+        """Return the Position of p's parent (or None if p is root)."""
+        return self._make_position(self._parent[self._validate(p)])
+
+    def num_children(self, p):
+        """Return the number of children of Position p."""
+        return self._num_children[self._validate(p)]
+
+    def children(self, p):
+        """Generate an iteration of Positions representing p's children."""
+        positions = self._positions
+        next_sibling = self._next_sibling
+        child = self._first_child[self._validate(p)]
+        while child != -1:
+            yield positions[child]
+            child = next_sibling[child]
+
+    def __len__(self):
+        """Return the total number of elements in the tree."""
+        return len(self._element)
+
+    def depth(self, p):
+        """Return the number of levels separating Position p from the root."""
+        parent = self._parent
+        node = self._validate(p)
+        d = 0
+        while parent[node] != -1:
+            node = parent[node]
+            d += 1
+        return d
+
+    #-------------------------- traversals over ids --------------------------
+    def _subtree_preorder(self, p):
+        positions = self._positions
+        for node in self._preorder_ids(self._validate(p)):
+            yield positions[node]
+
+    def _preorder_ids(self, node):
+        first_child = self._first_child
+        next_sibling = self._next_sibling
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            children = []
+            child = first_child[node]
+            while child != -1:
+                children.append(child)
+                child = next_sibling[child]
+            children.reverse()            # so the first child is popped first
+            stack.extend(children)
+
+    #-------------------------- all depths / heights at once --------------------------
+    # With numpy these use pointer jumping: every node doubles the distance to the
+    # ancestor it points at in each pass, so there are O(log height) vectorized passes.
+    # Without numpy they fall back to one O(n) pass in Python. Result index = node id.
+    def depths(self):
+        """Return the depth of every node."""
+        n = len(self)
+        if np is None:
+            depth = [0] * n
+            parent = self._parent
+            if n:
+                for node in self._preorder_ids(self._root):     # parents come before children
+                    if parent[node] != -1:
+                        depth[node] = depth[parent[node]] + 1
+            return depth
+        parent = np.frombuffer(self._parent, dtype=np.int64) if n else np.zeros(0, dtype=np.int64)
+        # invariant: ancestor[v] is dist[v] levels above v, or -1 when dist[v] is v's depth
+        dist = (parent != -1).astype(np.int64)
+        ancestor = parent.copy()
+        jumping = np.nonzero(ancestor != -1)[0]
+        while len(jumping):
+            up = ancestor[jumping]
+            dist[jumping] += dist[up]
+            ancestor[jumping] = ancestor[up]
+            jumping = jumping[ancestor[jumping] != -1]
+        return dist
+
+    def heights(self):
+        """Return the height of the subtree of every node."""
+        n = len(self)
+        if np is None:
+            height = [0] * n
+            parent = self._parent
+            if n:
+                for node in reversed(list(self._preorder_ids(self._root))):     # children first
+                    if parent[node] != -1 and height[node] + 1 > height[parent[node]]:
+                        height[parent[node]] = height[node] + 1
+            return height
+        depth = self.depths()
+        parent = np.frombuffer(self._parent, dtype=np.int64) if n else np.zeros(0, dtype=np.int64)
+        # deepest[v]: max depth among descendants of v less than 2^k levels below it.
+        # Each pass pushes it up to the ancestor exactly 2^k levels above.
+        deepest = depth.copy()
+        ancestor = parent.copy()
+        jumping = np.nonzero(ancestor != -1)[0]
+        while len(jumping):
+            pushed = deepest.copy()
+            np.maximum.at(pushed, ancestor[jumping], deepest[jumping])
+            deepest = pushed
+            ancestor[jumping] = ancestor[ancestor[jumping]]
+            jumping = jumping[ancestor[jumping] != -1]
+        return deepest - depth
+
+    #-------------------------- nonpublic mutators --------------------------
+    def _add_root(self, e):
+        if self._root != -1:
+            raise ValueError("Root exists")
+        self._root = self._new_node(e, -1)
+        return self._make_position(self._root)
+
+    def _add_child(self, p, e):
+        parent = self._validate(p)
+        node = self._new_node(e, parent)
+        self._link(parent, node)
+        return self._make_position(node)
+
+    def _replace(self, p, e):
+        node = self._validate(p)
+        old_element = self._element[node]
+        self._element[node] = e
+        return old_element
+
+    def _new_node(self, e, parent):
+        node = len(self._element)
+        self._element.append(e)
+        self._parent.append(parent)
+        self._first_child.append(-1)
+        self._last_child.append(-1)
+        self._next_sibling.append(-1)
+        self._num_children.append(0)
+        self._positions.append(self.Position(self, node))
+        return node
+
+    def _link(self, parent, node):
+        # Append node as the last child of parent
+        last = self._last_child[parent]
+        if last == -1:
+            self._first_child[parent] = node
+        else:
+            self._next_sibling[last] = node
+        self._last_child[parent] = node
+        self._num_children[parent] += 1
@@ -0,0 +1,93 @@
+from array import array
+
+class EulerTourIndex:
+    """Static index over a LinkedTree, built in one preorder pass.
+
+    Node i in preorder gets the entry time i and the exit time i + size of its
+    subtree, so the subtree of a node is a contiguous range of the preorder:
+        is_ancestor(p, q)    O(1)   entry/exit time comparison
+        subtree_sum(p)       O(1)   difference of prefix sums of value(element)
+        lca(p, q)            O(log n) binary lifting over 2^k-th ancestors
+    The prefix sums are built on the first subtree_sum for each value function and
+    kept, so is_ancestor / lca and sums with other value functions never rebuild
+    the index. The index describes the tree as it was when built;
+    LinkedTree.euler_index() drops it on every change and builds a new one on the
+    next query.
+    """
+    MAX_CACHED_SUMS = 8         # prefix sum arrays kept, one per value function
+
+    def __init__(self, tree):
+        self._tree = tree
+        order = []                          # nodes in preorder
+        parent = array('q')                 # preorder index of the parent, -1 for the root
+        stack = [(tree._root, -1)] if tree._root is not None else []
+        while stack:
+            node, p = stack.pop()
+            parent.append(p)
+            i = len(order)
+            order.append(node)
+            stack.extend((child, i) for child in reversed(node._children))
+        n = len(order)
+        self._order = order
+        self._entry = {node: i for i, node in enumerate(order)}
+
+        # subtree sizes: children come after their parent in preorder
+        size = array('q', [1]) * n
+        for i in range(n - 1, 0, -1):
+            size[parent[i]] += size[i]
+        self._exit = array('q', (i + size[i] for i in range(n)))
+
+        self._prefix = {}                   # value function -> prefix sums over the preorder
+
+        # _up[k][i]: the 2^k-th ancestor of node i (the root is its own ancestor)
+        root_parent = array('q', (p if p != -1 else 0 for p in parent))
+        self._up = [root_parent]
+        for _ in range(max(n - 1, 1).bit_length() - 1):
+            previous = self._up[-1]
+            self._up.append(array('q', (previous[previous[i]] for i in range(n))))
+
+    def _index(self, p):
+        return self._entry[self._tree._validate(p)]
+
+    def is_ancestor(self, p, q):
+        """Return True if Position p is an ancestor of q (or q itself)."""
+        i = self._index(p)
+        return i <= self._index(q) < self._exit[i]
+
+    def subtree_size(self, p):
+        """Return the number of nodes in the subtree rooted at p."""
+        i = self._index(p)
+        return self._exit[i] - i
+
+    def subtree_sum(self, p, value=None):
+        """Return the sum of value(element) (default: the elements) over the subtree rooted at p."""
+        i = self._index(p)
+        prefix = self._prefix_sums(value)
+        return prefix[self._exit[i]] - prefix[i]
+
+    def _prefix_sums(self, value):
+        prefix = self._prefix.get(value)
+        if prefix is None:
+            prefix = [0]
+            total = 0
+            for node in self._order:
+                total += node._element if value is None else value(node._element)
+                prefix.append(total)
+            if len(self._prefix) >= self.MAX_CACHED_SUMS:
+                del self._prefix[next(iter(self._prefix))]     # drop the oldest
+            self._prefix[value] = prefix
+        return prefix
+
+    def lca(self, p, q):
+        """Return the Position of the lowest common ancestor of p and q."""
+        i = self._index(p)
+        j = self._index(q)
+        exit_time = self._exit
+        if i <= j < exit_time[i]:
+            return self._tree._make_position(self._order[i])
+        # climb from i as far as possible while staying below the common ancestor
+        for up in reversed(self._up):
+            a = up[i]
+            if not a <= j < exit_time[a]:
+                i = a
+        return self._tree._make_position(self._order[self._up[0][i]])
@@ -1,3 +1,4 @@
+from euler_tour import EulerTourIndex
 from tree import Tree
 
 class LinkedTree(Tree):
@@ -6,7 +7,7 @@ class LinkedTree(Tree):
     #-------------------------- nested _Node class --------------------------
     class _Node:
         """Lightweight, nonpublic class for storing a node."""
-        __slots__ = '_element', '_parent', '_children' # streamline memory usage
+        __slots__ = '_element', '_parent', '_children', '_depth', '_height', '_index' # streamline memory usage
 
         def __init__(self, element, parent=None, children=None):
             self._element = element # the element of this node
@@ -15,6 +16,12 @@ class LinkedTree(Tree):
                 self._children = []
             else:
                 self._children = children # list of links towards children nodes
+                for i, child in enumerate(children):
+                    child._index = i
+            self._index = 0       # position in parent's _children, for O(1) removal
+            # nodes never move, so the depth is fixed when the node is created
+            self._depth = 0 if parent is None else parent._depth + 1
+            self._height = None   # cached height of the subtree, None = unknown
 
     #-------------------------- nested Position class --------------------------
     class Position(Tree.Position):
@@ -53,6 +60,7 @@ class LinkedTree(Tree):
         """Create an initially empty binary tree."""
         self._root = None
         self._size = 0
+        self._euler = None      # EulerTourIndex of the current tree, built on demand
 
     #-------------------------- public accessors --------------------------    
     def root(self):
@@ -78,7 +86,76 @@ class LinkedTree(Tree):
     def __len__(self):
         """Return the total number of elements in the tree."""
         return self._size # 길이를 반환
+
+    #-------------------------- cached depth / height --------------------------
+    def depth(self, p):
+        """Return the number of levels separating Position p from the root (O(1))."""
+        return self._validate(p)._depth
+
+    def _height(self, p):
+        """Return the height of the subtree rooted at Position p, cached per node."""
+        node = self._validate(p)
+        if node._height is None:
+            self._compute_heights(node)
+        return node._height
+
+    def _compute_heights(self, node):
+        # Iterative postorder over the nodes without a cached height.
+        # A cached node has cached descendants, so its subtree is skipped.
+        stack = [(node, False)]
+        while stack:
+            node, visited = stack.pop()
+            if visited:
+                node._height = 1 + max(c._height for c in node._children) if node._children else 0
+            elif node._height is None:
+                stack.append((node, True))
+                stack.extend((c, False) for c in node._children)
+
+    def _invalidate_heights(self, node):
+        # The subtree of node changed: drop the cached heights from node up to the root.
+        # An unknown height implies unknown heights above it, so the walk can stop there.
+        while node is not None and node._height is not None:
+            node._height = None
+            node = node._parent
+
+    # Traversals over the nodes directly (no validation or generator chain per position)
+    def _subtree_preorder(self, p):
+        stack = [self._validate(p)]
+        while stack:
+            node = stack.pop()
+            yield self._make_position(node)
+            stack.extend(reversed(node._children))
+
+    def _subtree_postorder(self, p):
+        stack = [(self._validate(p), 0)]       # (node, index of the next child to visit)
+        while stack:
+            node, i = stack[-1]
+            if i < len(node._children):
+                stack[-1] = (node, i + 1)
+                stack.append((node._children[i], 0))
+            else:
+                stack.pop()
+                yield self._make_position(node)
     
+    #-------------------------- Euler-tour index --------------------------
+    def euler_index(self):
+        """Return an EulerTourIndex of the tree, rebuilding it if the tree changed since."""
+        if self._euler is None:
+            self._euler = EulerTourIndex(self)
+        return self._euler
+
+    def is_ancestor(self, p, q):
+        """Return True if Position p is an ancestor of q (or q itself)."""
+        return self.euler_index().is_ancestor(p, q)
+
+    def lca(self, p, q):
+        """Return the Position of the lowest common ancestor of p and q."""
+        return self.euler_index().lca(p, q)
+
+    def subtree_sum(self, p, value=None):
+        """Return the sum of value(element) (default: the elements) in the subtree rooted at p."""
+        return self.euler_index().subtree_sum(p, value)
+
     #-------------------------- nonpublic mutators --------------------------
     def _add_root(self, e):
         #  This method places element 'e' at the root of an empty tree and returns the new Position.
@@ -87,6 +164,7 @@ class LinkedTree(Tree):
             raise ValueError("Root exists")
         self._root = self._Node(e)
         self._size = 1
+        self._euler = None
         return self._make_position(self._root) # (use self._make_position(node) to pack the Node object into a position.)
         # raise NotImplementedError('HOMEWORK 2-1')
 
@@ -94,15 +172,34 @@ class LinkedTree(Tree):
         # This method creates a new child node for the given Position 'p' and stores the element 'e'.
         node = self._validate(p) #  (use self._validate(position) to unpack the node inside the position.)
         new_child = self._Node(e, parent=node)
+        new_child._index = len(node._children)
         node._children.append(new_child)
         self._size += 1
+        self._invalidate_heights(node)
+        self._euler = None
         return self._make_position(new_child) # It returns the Position of the newly created node (use self._make_position(new_node)).
         # raise NotImplementedError('HOMEWORK 2-1')
 
+    def _add_children(self, p, elements):
+        # Add a child for every element of the iterable, in order; return their Positions.
+        node = self._validate(p)
+        children = node._children
+        start = len(children)
+        children.extend(self._Node(e, parent=node) for e in elements)
+        for i in range(start, len(children)):
+            children[i]._index = i
+        self._size += len(children) - start
+        if len(children) > start:
+            self._invalidate_heights(node)
+            self._euler = None
+        return [self._make_position(child) for child in children[start:]]
+
     def _replace(self, p, e):
         node = self._validate(p)
         old_element = node._element
         node._element = e # This method replaces the element at the given Position 'p' with the new element 'e'.
+        if self._euler is not None:
+            self._euler._prefix.clear()     # the shape is unchanged, only the sums are stale
         return old_element # It returns the old element that was replaced.
         # raise NotImplementedError('HOMEWORK 2-1')
 
@@ -111,14 +208,40 @@ class LinkedTree(Tree):
         # If the position 'p' has any children, a ValueError is raised.
         node = self._validate(p)
         
-        # if node._children is not None:
-        if self.num_children != 0:
-            raise ValueError # If the position 'p' has any children, a ValueError is raised.
-        if node._parent is not None:
-            node._parent._children.remove(node)
-        else:
-            self._root = None
+        if node._children:
+            raise ValueError('p has children') # If the position 'p' has any children, a ValueError is raised.
+        self._unlink(node)
         self._size -= 1
         node._parent = node  # Convention for deprecated nodes
         return node._element
-        # raise NotImplementedError('HOMEWORK 2-1')
\ No newline at end of file
+        # raise NotImplementedError('HOMEWORK 2-1')
+
+    def _delete_subtree(self, p):
+        # Delete Position p together with all its descendants; return the number of nodes removed.
+        node = self._validate(p)
+        self._unlink(node)
+        count = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            stack.extend(node._children)
+            node._children = []
+            node._parent = node  # Convention for deprecated nodes
+            count += 1
+        self._size -= count
+        return count
+
+    def _unlink(self, node):
+        # Remove node from its parent's children in O(1): the last sibling takes its slot,
+        # so children() keeps a deterministic order without shifting the list.
+        self._euler = None
+        parent = node._parent
+        if parent is None:
+            self._root = None
+            return
+        siblings = parent._children
+        last = siblings.pop()
+        if last is not node:
+            siblings[node._index] = last
+            last._index = node._index
+        self._invalidate_heights(parent)
\ No newline at end of file
@@ -81,17 +81,23 @@ class Tree:
 
     def depth(self, p):
         """Return the number of levels separating Position p from the root."""
-        if self.is_root(p):
-            return 0
-        else:
-            return 1 + self.depth(self.parent(p))
+        d = 0
+        while not self.is_root(p):                    # climb to the root, no recursion
+            p = self.parent(p)
+            d += 1
+        return d
 
     def _height(self, p):                                    # time is linear in size of subtree
         """Return the height of the subtree rooted at Position p."""
-        if self.is_leaf(p):
-            return 0
-        else:
-            return 1 + max(self._height(c) for c in self.children(p))
+        height = 0
+        stack = [(p, 0)]                              # (position, depth below p)
+        while stack:
+            q, d = stack.pop()
+            if d > height:
+                height = d
+            for c in self.children(q):
+                stack.append((c, d + 1))
+        return height
 
     def height(self, p=None):
         """Return the height of the subtree rooted at Position p.
@@ -119,10 +125,14 @@ class Tree:
 
     def _subtree_preorder(self, p):
         """Generate a preorder iteration of positions in subtree rooted at p."""
-        yield p                       # visit p before its subtrees
-        for c in self.children(p):                 # for each child c
-            for other in self._subtree_preorder(c):              # do preorder of c's subtree
-                yield other                                               # yielding each to our caller
+        # explicit stack instead of nested generators: each position is yielded once, O(n) total
+        stack = [p]
+        while stack:
+            p = stack.pop()
+            yield p                       # visit p before its subtrees
+            children = list(self.children(p))
+            children.reverse()            # so the first child is popped first
+            stack.extend(children)
 
     def postorder(self):
         """Generate a postorder iteration of positions in the tree."""
@@ -132,10 +142,15 @@ class Tree:
 
     def _subtree_postorder(self, p):
         """Generate a postorder iteration of positions in subtree rooted at p."""
-        for c in self.children(p):       # for each child c
-            for other in self._subtree_postorder(c):  # do postorder of c's subtree
-                yield other      # yielding each to our caller
-        yield p             # visit p after its subtrees
+        stack = [(p, iter(self.children(p)))]    # (position, its remaining children)
+        while stack:
+            p, remaining = stack[-1]
+            for c in remaining:
+                stack.append((c, iter(self.children(c))))   # descend into the next child
+                break
+            else:
+                stack.pop()
+                yield p             # visit p after its subtrees
         
     def levelorder(self):
         """Generate a levelorder iteration of positions in the tree."""
@@ -0,0 +1,501 @@
+from array import array
+import random
+import tracemalloc
+
+from redblack_tree import RedBlackTree
+
+class ArrayRedBlackTree():
+    """Red-black tree stored as parallel arrays (struct of arrays).
+
+    A node is just an int id. The element, parent, left, right and color of
+    node i live at index i of five flat arrays, so there is no Python object
+    per node and nothing for the garbage collector to traverse.
+    Slots of deleted nodes are kept in a free list and reused by insert.
+    """
+    RED = 1
+    BLACK = 0
+    NIL = -1                    # id used for "no node"
+
+    def __init__(self, typecode='q'):
+        """Create an empty tree. typecode is the array typecode of the elements ('q', 'd', ...)."""
+        self._element = array(typecode)
+        self._parent = array('q')
+        self._left = array('q')
+        self._right = array('q')
+        self._color = bytearray()
+        self._root = self.NIL
+        self._size = 0
+        self._free = self.NIL   # head of the free list, linked through _left
+
+    def __len__(self):
+        return self._size
+
+    # Search for the element.
+    # return: node id, or None if it's non-existing
+    def search(self, element):
+        elements = self._element
+        left = self._left
+        right = self._right
+        node = self._root
+        while node != -1:
+            current = elements[node]
+            if element < current:
+                node = left[node]
+            elif element > current:
+                node = right[node]
+            else:
+                return node
+        return None
+
+    def element(self, node):
+        """Return the element stored at node id."""
+        return self._element[node]
+
+    def insert(self, element):
+        elements = self._element
+        parent_node = self.NIL
+        current_node = self._root
+        while current_node != -1:
+            parent_node = current_node
+            if element < elements[current_node]:
+                current_node = self._left[current_node]
+            else:
+                current_node = self._right[current_node]
+        node = self._new_node(element, parent_node)
+        if parent_node == self.NIL:
+            self._root = node
+        elif element < elements[parent_node]:
+            self._left[parent_node] = node
+        else:
+            self._right[parent_node] = node
+        self._size += 1
+        self._fix_insert(node)
+        return node
+
+    def delete(self, element):
+        node = self.search(element)
+        if node is None:
+            return
+        if self._left[node] != self.NIL and self._right[node] != self.NIL:
+            # Case 1 : node has two children
+            successor = self._successor(node)
+            self._element[node] = self._element[successor]
+            node = successor
+
+        leaf = self._right[node]
+        if leaf == self.NIL:
+            leaf = self._left[node]
+
+        if self._color[node] == self.RED:
+            self._replace_node(node, leaf)
+        elif leaf != self.NIL and self._color[leaf] == self.RED:
+            # Case 2 : node is BLACK, and non-leaf child is RED
+            self._color[leaf] = self.BLACK
+            self._replace_node(node, leaf)
+        else:
+            # Case 3 : node is BLACK, and both children are BLACK or NIL
+            self._delete_case1(node)
+            self._replace_node(node, leaf)
+
+        self._free_node(node)
+        self._size -= 1
+
+    # In-order iteration of the elements, walking parent ids (no stack)
+    def __iter__(self):
+        node = self._first_node(self._root)
+        while node != -1:
+            yield self._element[node]
+            node = self._next_node(node)
+
+    def __reversed__(self):
+        node = self._last_node(self._root)
+        while node != -1:
+            yield self._element[node]
+            node = self._prev_node(node)
+
+    def inorder_traverse(self):
+        return list(self)
+
+    #-------------------------- node slots --------------------------
+    def _new_node(self, element, parent):
+        node = self._free
+        if node != self.NIL:
+            # reuse a deleted slot
+            self._free = self._left[node]
+            self._element[node] = element
+            self._parent[node] = parent
+            self._left[node] = self.NIL
+            self._right[node] = self.NIL
+            self._color[node] = self.RED
+        else:
+            node = len(self._color)
+            self._element.append(element)
+            self._parent.append(parent)
+            self._left.append(self.NIL)
+            self._right.append(self.NIL)
+            self._color.append(self.RED)
+        return node
+
+    def _free_node(self, node):
+        self._parent[node] = self.NIL
+        self._right[node] = self.NIL
+        self._left[node] = self._free
+        self._free = node
+
+    #-------------------------- rebalancing --------------------------
+    def _fix_insert(self, node):
+        parent = self._parent
+        color = self._color
+        RED = self.RED
+        BLACK = self.BLACK
+        while node != self._root and color[parent[node]] == RED:
+            p = parent[node]
+            g = parent[p]
+            if p == self._right[g]:
+                uncle = self._left[g]
+                if uncle != -1 and color[uncle] == RED:
+                    # Case 1 : uncle and parent are RED -> recolor and move up
+                    color[p] = BLACK
+                    color[uncle] = BLACK
+                    color[g] = RED
+                    node = g
+                else:
+                    if node == self._left[p]:
+                        # Case 2 : node is parent's left -> rotate right at parent
+                        node = p
+                        self._rotate_right(node)
+                    # Case 3 : node is parent's right -> rotate left at grandparent
+                    p = parent[node]
+                    g = parent[p]
+                    color[p] = BLACK
+                    color[g] = RED
+                    self._rotate_left(g)
+            else:
+                # symmetric to the above cases
+                uncle = self._right[g]
+                if uncle != -1 and color[uncle] == RED:
+                    color[p] = BLACK
+                    color[uncle] = BLACK
+                    color[g] = RED
+                    node = g
+                else:
+                    if node == self._right[p]:
+                        node = p
+                        self._rotate_left(node)
+                    p = parent[node]
+                    g = parent[p]
+                    color[p] = BLACK
+                    color[g] = RED
+                    self._rotate_right(g)
+        color[self._root] = BLACK
+
+    # Case 1 : node has no parent
+    def _delete_case1(self, node):
+        if self._parent[node] != self.NIL:
+            self._delete_case2(node)
+        else:
+            self._root = node
+
+    # Case 2 : sibling is RED
+    def _delete_case2(self, node):
+        sibling = self._sibling(node)
+        parent = self._parent[node]
+        if self._color[sibling] == self.RED:
+            self._color[parent] = self.RED
+            self._color[sibling] = self.BLACK
+            if node == self._left[parent]:
+                self._rotate_left(parent)
+            else:
+                self._rotate_right(parent)
+        self._delete_case3(node)
+
+    # Case 3 : parent, sibling, and sibling's children are BLACK
+    def _delete_case3(self, node):
+        sibling = self._sibling(node)
+        parent = self._parent[node]
+        if (self._color[parent] == self.BLACK and
+            self._color[sibling] == self.BLACK and
+            self._is_black(self._left[sibling]) and
+            self._is_black(self._right[sibling])):
+            self._color[sibling] = self.RED
+            self._delete_case1(parent)
+        else:
+            self._delete_case4(node)
+
+    # Case 4 : parent is RED, and sibling and sibling's children are BLACK
+    def _delete_case4(self, node):
+        sibling = self._sibling(node)
+        parent = self._parent[node]
+        if (self._color[parent] == self.RED and
+            self._color[sibling] == self.BLACK and
+            self._is_black(self._left[sibling]) and
+            self._is_black(self._right[sibling])):
+            self._color[sibling] = self.RED
+            self._color[parent] = self.BLACK
+        else:
+            self._delete_case5(node)
+
+    # Case 5 : sibling is BLACK and has at least one RED child
+    def _delete_case5(self, node):
+        sibling = self._sibling(node)
+        parent = self._parent[node]
+        if self._color[sibling] == self.BLACK:
+            if (node == self._left[parent] and
+                self._is_black(self._right[sibling]) and
+                not self._is_black(self._left[sibling])):
+                self._color[sibling] = self.RED
+                self._color[self._left[sibling]] = self.BLACK
+                self._rotate_right(sibling)
+            elif (node == self._right[parent] and
+                self._is_black(self._left[sibling]) and
+                not self._is_black(self._right[sibling])):
+                self._color[sibling] = self.RED
+                self._color[self._right[sibling]] = self.BLACK
+                self._rotate_left(sibling)
+        self._delete_case6(node)
+
+    # Case 6 : adjust colors, and rotate for balance
+    def _delete_case6(self, node):
+        sibling = self._sibling(node)
+        parent = self._parent[node]
+        self._color[sibling] = self._color[parent]
+        self._color[parent] = self.BLACK
+        if node == self._left[parent]:
+            self._color[self._right[sibling]] = self.BLACK
+            self._rotate_left(parent)
+        else:
+            self._color[self._left[sibling]] = self.BLACK
+            self._rotate_right(parent)
+
+    # Replace a node with its child
+    def _replace_node(self, node, child):
+        parent = self._parent[node]
+        if child != self.NIL:
+            self._parent[child] = parent
+        if parent == self.NIL:
+            self._root = child
+        elif node == self._left[parent]:
+            self._left[parent] = child
+        else:
+            self._right[parent] = child
+        self._parent[node] = self.NIL
+
+    def _rotate_left(self, node):
+        left = self._left
+        right = self._right
+        parent = self._parent
+        y = right[node]
+        right[node] = left[y]
+        if left[y] != -1:
+            parent[left[y]] = node
+        parent[y] = parent[node]
+        if parent[node] == -1:
+            self._root = y
+        elif node == left[parent[node]]:
+            left[parent[node]] = y
+        else:
+            right[parent[node]] = y
+        left[y] = node
+        parent[node] = y
+
+    def _rotate_right(self, node):
+        left = self._left
+        right = self._right
+        parent = self._parent
+        y = left[node]
+        left[node] = right[y]
+        if right[y] != -1:
+            parent[right[y]] = node
+        parent[y] = parent[node]
+        if parent[node] == -1:
+            self._root = y
+        elif node == right[parent[node]]:
+            right[parent[node]] = y
+        else:
+            left[parent[node]] = y
+        right[y] = node
+        parent[node] = y
+
+    #-------------------------- navigation --------------------------
+    def _is_black(self, node):
+        return node == self.NIL or self._color[node] == self.BLACK
+
+    def _sibling(self, node):
+        parent = self._parent[node]
+        if self._left[parent] == node:
+            return self._right[parent]
+        else:
+            return self._left[parent]
+
+    def _successor(self, node):
+        return self._first_node(self._right[node])
+
+    def _first_node(self, node):
+        if node != self.NIL:
+            while self._left[node] != self.NIL:
+                node = self._left[node]
+        return node
+
+    def _last_node(self, node):
+        if node != self.NIL:
+            while self._right[node] != self.NIL:
+                node = self._right[node]
+        return node
+
+    def _next_node(self, node):
+        if self._right[node] != self.NIL:
+            return self._first_node(self._right[node])
+        parent = self._parent[node]
+        while parent != self.NIL and node == self._right[parent]:
+            node = parent
+            parent = self._parent[parent]
+        return parent
+
+    def _prev_node(self, node):
+        if self._left[node] != self.NIL:
+            return self._last_node(self._left[node])
+        parent = self._parent[node]
+        while parent != self.NIL and node == self._left[parent]:
+            node = parent
+            parent = self._parent[parent]
+        return parent
+
+    #-------------------------- supporting functions --------------------------
+    # Same output and checks as the ones in RedBlackTree, on node ids.
+    def display(self):
+        print('--------------')
+        self._display(self._root, 0)
+        print('--------------')
+
+    def _display(self, node, depth):
+        if node == self.NIL:
+            return
+        self._display(self._right[node], depth+1)
+        symbol = '>' if node == self._root else '*'
+        colorstr = 'R' if self._color[node] == self.RED else 'B'
+        print(f'{"    "*depth}{symbol} {self._element[node]}({colorstr})')
+        self._display(self._left[node], depth+1)
+
+    def check_tree_property_silent(self):
+        if self._root == self.NIL:
+            return True
+
+        if not self._check_parent_child_link(self._root):
+            print('Parent-child link is violated')
+            return False
+        if not self._check_binary_search_tree_property(self._root):
+            print('Binary search tree property is violated')
+            return False
+        if not self._color[self._root] == self.BLACK:
+            print('Root black property is violated')
+            return False
+        if not self._check_double_red_property(self._root):
+            print('Internal property is violated')
+            return False
+        if self._check_black_height_property(self._root) == 0:
+            print('Black height property is violated')
+            return False
+        return True
+
+    def check_tree_property(self):
+        if self._root == self.NIL:
+            print('Empty tree')
+            return
+
+        print('Checking binary search tree property...')
+        self._check_parent_child_link(self._root)
+        self._check_binary_search_tree_property(self._root)
+        print('Done')
+
+        print('Checking root black property...')
+        print(self._color[self._root] == self.BLACK)
+        print('Done')
+
+        print('Checking internal property (=no double red)...')
+        self._check_double_red_property(self._root)
+        print('Done')
+
+        print('Checking black height property...')
+        self._check_black_height_property(self._root)
+        print('Done')
+
+    def _check_parent_child_link(self, node):
+        if node == self.NIL:
+            return True
+        test_pass = True
+        for child in (self._right[node], self._left[node]):
+            if child != self.NIL:
+                if self._parent[child] != node:
+                    print("parent-child error - ", self._element[node], self._element[child])
+                    test_pass = False
+                test_pass = self._check_parent_child_link(child) and test_pass
+        return test_pass
+
+    def _check_binary_search_tree_property(self, node):
+        if node == self.NIL:
+            return True
+        left = self._left[node]
+        right = self._right[node]
+        if left != self.NIL:
+            if self._element[left] > self._element[node]:
+                print("Binary search tree property error - ", self._element[node], self._element[left])
+                return False
+            if not self._check_binary_search_tree_property(left):
+                return False
+        if right != self.NIL:
+            if self._element[right] < self._element[node]:
+                print("Binary search tree property error - ", self._element[node], self._element[right])
+                return False
+            if not self._check_binary_search_tree_property(right):
+                return False
+        return True
+
+    def _check_double_red_property(self, node):
+        if node == self.NIL:
+            return True
+        for child in (self._left[node], self._right[node]):
+            if child != self.NIL:
+                if self._color[node] == self.RED and self._color[child] == self.RED:
+                    print("Double red property error - ", self._element[node], self._element[child])
+                    return False
+                if not self._check_double_red_property(child):
+                    return False
+        return True
+
+    def _check_black_height_property(self, node):
+        if node == self.NIL:
+            return 1
+        left_height = self._check_black_height_property(self._left[node])
+        right_height = self._check_black_height_property(self._right[node])
+        if left_height != right_height or left_height == 0:
+            print("Black height property error - ", self._element[node], left_height, right_height)
+            return 0
+        if self._color[node] == self.BLACK:
+            return left_height + 1
+        else:
+            return left_height
+
+
+# Measure the memory held by n random integer keys in both storage engines
+def compare_memory(n, seed=0):
+    keys = list(range(n))
+    random.Random(seed).shuffle(keys)
+    result = {}
+    for name, make_tree in (('RedBlackTree', RedBlackTree), ('ArrayRedBlackTree', ArrayRedBlackTree)):
+        tracemalloc.start()
+        tree = make_tree()
+        for key in keys:
+            tree.insert(key)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[name] = {'bytes': current, 'peak_bytes': peak, 'bytes_per_key': current / n}
+        del tree
+    return result
+
+
+if __name__ == '__main__':
+    for n in (10**4, 10**5, 10**6):
+        result = compare_memory(n)
+        print(f'n = {n}')
+        for name, stats in result.items():
+            print(f'    {name:18s} {stats["bytes"] / 2**20:8.1f} MiB  {stats["bytes_per_key"]:6.1f} B/key')
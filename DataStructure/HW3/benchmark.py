@@ -0,0 +1,209 @@
+"""Microbenchmarks for RedBlackTree.
+
+Measures insert, search, delete and inorder_traverse over several workloads
+and sizes, and reports ops/sec, comparison / rotation / recolor counts (taken
+from InstrumentedRedBlackTree in a separate untimed run), peak memory and tree
+height. Results can be written as JSON and compared with an older run:
+
+    python benchmark.py --sizes 1e3 1e4 1e5 --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from instrumented_redblack_tree import InstrumentedRedBlackTree
+from redblack_tree import RedBlackTree
+
+WORKLOADS = ('sorted', 'reverse', 'random', 'duplicates')
+OPERATIONS = ('insert', 'search', 'inorder_traverse', 'delete')
+
+
+def make_keys(workload, n, seed=0):
+    """Return the list of keys to insert for a workload."""
+    rng = random.Random(seed)
+    if workload == 'sorted':
+        return list(range(n))
+    if workload == 'reverse':
+        return list(range(n - 1, -1, -1))
+    if workload == 'random':
+        keys = list(range(n))
+        rng.shuffle(keys)
+        return keys
+    if workload == 'duplicates':
+        # about 90% of the keys are repeats
+        return [rng.randrange(max(n // 10, 1)) for _ in range(n)]
+    raise ValueError(f'unknown workload: {workload}')
+
+
+#-------------------------- measurements --------------------------
+def _time_operations(keys, seed):
+    """Run every operation once on a fresh tree and return seconds per operation."""
+    rng = random.Random(seed)
+    lookups = list(keys)
+    rng.shuffle(lookups)
+    seconds = {}
+    tree = RedBlackTree()
+
+    insert = tree.insert
+    start = time.perf_counter()
+    for key in keys:
+        insert(key)
+    seconds['insert'] = time.perf_counter() - start
+
+    search = tree.search
+    start = time.perf_counter()
+    for key in lookups:
+        search(key)
+    seconds['search'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree.inorder_traverse()
+    seconds['inorder_traverse'] = time.perf_counter() - start
+
+    height = tree.validate(max_errors=1)['height']
+
+    delete = tree.delete
+    start = time.perf_counter()
+    for key in lookups:
+        delete(key)
+    seconds['delete'] = time.perf_counter() - start
+    return seconds, height
+
+
+def _count_rebalancing(keys, seed):
+    """Rebalancing work of the inserts and of the deletes, from an instrumented tree."""
+    rng = random.Random(seed)
+    lookups = list(keys)
+    rng.shuffle(lookups)
+    tree = InstrumentedRedBlackTree(record_latency=False)
+    counts = {}
+
+    for key in keys:
+        tree.insert(key)
+    stats = tree.stats()
+    counts['insert'] = {'rotations': stats['rotations'], 'recolors': stats['recolors'],
+                        'comparisons': stats['comparisons']}
+
+    tree.reset_stats()
+    for key in lookups:
+        tree.delete(key)
+    stats = tree.stats()
+    counts['delete'] = {'rotations': stats['rotations'], 'recolors': stats['recolors'],
+                        'comparisons': stats['comparisons'], 'delete_cases': stats['delete_cases']}
+    return counts
+
+
+def _peak_memory(keys):
+    """Peak traced bytes while building the tree."""
+    tracemalloc.start()
+    tree = RedBlackTree()
+    for key in keys:
+        tree.insert(key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run_case(workload, n, repeat=3, seed=0):
+    """Benchmark one (workload, n) pair; timings are the best of `repeat` runs."""
+    keys = make_keys(workload, n, seed)
+    best = {}
+    height = 0
+    for i in range(repeat):
+        seconds, height = _time_operations(keys, seed + i)
+        for operation, value in seconds.items():
+            best[operation] = min(value, best.get(operation, value))
+
+    result = {'workload': workload, 'n': n, 'height': height, 'operations': {}}
+    rebalancing = _count_rebalancing(keys, seed)
+    for operation in OPERATIONS:
+        # inorder_traverse is a single call: its ops/sec counts elements visited
+        stats = {'seconds': best[operation],
+                 'ops_per_sec': n / best[operation] if best[operation] > 0 else float('inf')}
+        if operation in rebalancing:
+            stats.update(rebalancing[operation])
+        result['operations'][operation] = stats
+    result['peak_memory_bytes'] = _peak_memory(keys)
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, workloads=WORKLOADS, repeat=3, seed=0, verbose=True):
+    report = {'commit': _git_commit(),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'results': []}
+    for n in sizes:
+        for workload in workloads:
+            result = run_case(workload, n, repeat, seed)
+            report['results'].append(result)
+            if verbose:
+                print_result(result)
+    return report
+
+
+#-------------------------- output --------------------------
+def print_result(result):
+    print(f"{result['workload']:>10s} n={result['n']:<9d} height={result['height']:<3d} "
+          f"peak={result['peak_memory_bytes'] / 2**20:8.1f} MiB")
+    for operation, stats in result['operations'].items():
+        line = f"    {operation:16s} {stats['ops_per_sec']:14,.0f} ops/s"
+        if 'rotations' in stats:
+            line += (f"   comparisons={stats['comparisons']:<10d} rotations={stats['rotations']:<9d} "
+                     f"recolors={stats['recolors']}")
+        print(line)
+
+
+def compare(old_report, new_report):
+    """Print new/old throughput ratios for the cases present in both reports."""
+    old = {(r['workload'], r['n']): r for r in old_report['results']}
+    print(f"comparing {old_report.get('commit')} -> {new_report.get('commit')}")
+    for result in new_report['results']:
+        before = old.get((result['workload'], result['n']))
+        if before is None:
+            continue
+        ratios = []
+        for operation, stats in result['operations'].items():
+            if operation in before['operations']:
+                ratio = stats['ops_per_sec'] / before['operations'][operation]['ops_per_sec']
+                ratios.append(f'{operation} x{ratio:.2f}')
+        print(f"{result['workload']:>10s} n={result['n']:<9d} " + '  '.join(ratios))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='RedBlackTree microbenchmarks')
+    parser.add_argument('--sizes', nargs='+', default=['1e3', '1e4', '1e5'],
+                        help='numbers of keys, e.g. 1e3 1e4 ... 1e7')
+    parser.add_argument('--workloads', nargs='+', default=list(WORKLOADS), choices=WORKLOADS)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case (best is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report to this file ("-" for stdout)')
+    parser.add_argument('--compare', help='JSON report of an earlier run to compare against')
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(size)) for size in args.sizes]
+    report = run(sizes, args.workloads, args.repeat, args.seed, verbose=args.output != '-')
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+    elif args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+from contextlib import contextmanager
+import random
+import threading
+
+from redblack_tree import RedBlackTree
+
+class _ReadWriteLock():
+    """Many readers or one writer. Waiting writers block new readers, so writers do not starve."""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class ConcurrentRedBlackTree():
+    """Thread-safe wrapper around a RedBlackTree.
+
+    search, len, iteration and the checks run under a shared read lock; insert
+    and delete take the lock exclusively, because rebalancing relinks several
+    nodes in steps that readers must not observe half done.
+
+    With batch=True, updates are queued (group commit): the writer that finds no
+    batch in progress becomes the leader, takes the write lock once and applies
+    every queued update, including those queued while it works. The other
+    writers never touch the write lock; they wait until the leader reports
+    their update applied. Each insert/delete still returns only once it is
+    applied, and re-raises the exception its update raised, if any.
+    insert_many applies a whole batch of one caller under one acquisition.
+    """
+
+    def __init__(self, tree=None, batch=False):
+        self._tree = tree if tree is not None else RedBlackTree()
+        self._lock = _ReadWriteLock()
+        self._batch = batch
+        self._pending = []              # (ticket, operation, element)
+        self._queue = threading.Condition(threading.Lock())
+        self._leading = False           # a leader is applying the queue
+        self._queued = 0                # last ticket handed out
+        self._applied = 0               # every ticket up to this one is applied
+        self._failed = {}               # ticket -> exception raised by its update
+        self.write_acquisitions = 0     # times the write lock was taken for insert/delete
+
+    @contextmanager
+    def read_locked(self):
+        """Hold the read lock, e.g. for several searches that must see the same tree."""
+        self._lock.acquire_read()
+        try:
+            yield self._tree
+        finally:
+            self._lock.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """Hold the write lock, for compound updates on the wrapped tree."""
+        self._lock.acquire_write()
+        try:
+            yield self._tree
+        finally:
+            self._lock.release_write()
+
+    #-------------------------- reads --------------------------
+    # Results are taken while the read lock is held. The tree's _Node is never
+    # handed out: a later delete may move another element into it or unlink it.
+    def search(self, element):
+        """Return the stored element equal to element, or None."""
+        with self.read_locked() as tree:
+            node = tree.search(element)
+            return node._element if node is not None else None
+
+    def __contains__(self, element):
+        with self.read_locked() as tree:
+            return tree.search(element) is not None
+
+    def __len__(self):
+        with self.read_locked() as tree:
+            return len(tree)
+
+    # Iteration is over a copy taken under the read lock, so writers are not held
+    # up for as long as the caller keeps the iterator
+    def __iter__(self):
+        return iter(self.inorder_traverse())
+
+    def inorder_traverse(self):
+        with self.read_locked() as tree:
+            return tree.inorder_traverse()
+
+    def check_tree_property_silent(self):
+        with self.read_locked() as tree:
+            return tree.check_tree_property_silent()
+
+    #-------------------------- writes --------------------------
+    def insert(self, element):
+        self._write('insert', element)
+
+    def delete(self, element):
+        self._write('delete', element)
+
+    def insert_many(self, elements):
+        """Insert every element under a single write lock acquisition."""
+        elements = list(elements)       # consume the iterable before blocking readers
+        with self.write_locked() as tree:
+            self.write_acquisitions += 1
+            tree.insert_many(elements)
+
+    def _write(self, operation, element):
+        if not self._batch:
+            with self.write_locked() as tree:
+                self.write_acquisitions += 1
+                getattr(tree, operation)(element)
+            return
+        with self._queue:
+            self._queued += 1
+            ticket = self._queued
+            self._pending.append((ticket, operation, element))
+            if self._leading:
+                # follower: the leader applies this update
+                while self._applied < ticket:
+                    self._queue.wait()
+                error = self._failed.pop(ticket, None)
+                if error is not None:
+                    raise error
+                return
+            self._leading = True
+        self._lead()
+        error = self._failed.pop(ticket, None)
+        if error is not None:
+            raise error
+
+    def _lead(self):
+        # Apply queued updates under one write lock until the queue is empty.
+        # _leading is cleared under the queue lock together with the emptiness
+        # check, so an update queued afterwards finds no leader and leads itself.
+        with self.write_locked() as tree:
+            self.write_acquisitions += 1
+            while True:
+                with self._queue:
+                    if not self._pending:
+                        self._leading = False
+                        return
+                    pending, self._pending = self._pending, []
+                failed = {}
+                for ticket, operation, element in pending:
+                    try:
+                        getattr(tree, operation)(element)
+                    except Exception as error:
+                        failed[ticket] = error
+                with self._queue:
+                    self._failed.update(failed)
+                    self._applied = pending[-1][0]
+                    self._queue.notify_all()
+
+
+# Multi-threaded stress test: writers insert/delete disjoint key ranges while
+# readers search and iterate; afterwards the tree must hold the expected keys
+# and pass check_tree_property_silent.
+# Returns (errors, number of write lock acquisitions).
+def stress_test(threads=8, operations=20000, batch=False, seed=0):
+    tree = ConcurrentRedBlackTree(batch=batch)
+    expected = [set() for _ in range(threads)]
+    errors = []
+
+    def writer(index):
+        rng = random.Random(seed + index)
+        keys = expected[index]
+        for _ in range(operations):
+            key = rng.randrange(1000) * threads + index    # only this thread touches key % threads == index
+            if key in keys and rng.random() < 0.4:
+                tree.delete(key)
+                keys.discard(key)
+            elif key not in keys:
+                tree.insert(key)
+                keys.add(key)
+
+    def reader(index):
+        rng = random.Random(-seed - index - 1)
+        for i in range(operations):
+            tree.search(rng.randrange(1000 * threads))
+            if i % 500 == 0:
+                snapshot = tree.inorder_traverse()
+                if any(snapshot[j] > snapshot[j+1] for j in range(len(snapshot) - 1)):
+                    errors.append('iteration not sorted')
+
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    workers += [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    if not tree.check_tree_property_silent():
+        errors.append('red-black properties violated')
+    if tree.inorder_traverse() != sorted(set().union(*expected)):
+        errors.append('elements differ from the expected set')
+    return errors, tree.write_acquisitions
+
+
+if __name__ == '__main__':
+    for batch in (False, True):
+        errors, acquisitions = stress_test(batch=batch)
+        print(f'batch={batch}: {"OK" if not errors else ", ".join(errors)}  '
+              f'({acquisitions} write lock acquisitions)')
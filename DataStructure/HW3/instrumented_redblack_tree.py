@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import Counter
+
+from redblack_tree import RedBlackTree
+
+class _CountedKey:
+    """Wraps the key of one search/insert so that every comparison is counted."""
+    __slots__ = 'value', 'counters'
+
+    def __init__(self, value, counters):
+        self.value = value
+        self.counters = counters
+
+    # Two wrapped keys (batches compare keys with each other) count as one comparison
+    def __lt__(self, other):
+        self.counters['comparisons'] += 1
+        if isinstance(other, _CountedKey):
+            other = other.value
+        return self.value < other
+
+    def __gt__(self, other):
+        self.counters['comparisons'] += 1
+        if isinstance(other, _CountedKey):
+            other = other.value
+        return self.value > other
+
+
+# counters of the tree running an operation in this thread, so that trees used
+# from different threads do not count each other's recolors
+_active = threading.local()
+
+
+class _InstrumentedNode(RedBlackTree._Node):
+    """Node that counts color assignments which actually change the color."""
+    __slots__ = ()
+    _color_slot = RedBlackTree._Node.__dict__['_color']
+
+    def _get_color(self):
+        return _InstrumentedNode._color_slot.__get__(self)
+
+    def _set_color(self, color):
+        slot = _InstrumentedNode._color_slot
+        try:
+            changed = slot.__get__(self) is not color
+        except AttributeError:      # first assignment, from __init__
+            changed = False
+        if changed:
+            counters = getattr(_active, 'counters', None)
+            if counters is not None:
+                counters['recolors'] += 1
+        slot.__set__(self, color)
+
+    _color = property(_get_color, _set_color)
+
+
+class InstrumentedRedBlackTree(RedBlackTree):
+    """RedBlackTree that counts what its operations do.
+
+    Counts comparisons (in search, insert, delete and the batched search_many,
+    insert_many and bulk_insert), rotations, recolorings and which delete case
+    fired, and keeps a latency histogram per operation (one entry per batch for
+    the batched ones).
+    Instrumentation is opt-in by using this class: RedBlackTree itself has no
+    counting code at all, so it pays nothing.
+    """
+    _Node = _InstrumentedNode
+
+    def __init__(self, record_latency=True):
+        super().__init__()
+        self._record_latency = record_latency
+        self._in_delete = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self._counters = Counter(comparisons=0, rotations=0, recolors=0)
+        self._delete_cases = Counter()     # how often each _delete_caseN was entered
+        # histogram buckets are powers of two in nanoseconds: bucket b holds 2^b <= t < 2^(b+1)
+        self._latency = {operation: Counter() for operation in
+                         ('search', 'insert', 'delete', 'search_many', 'insert_many', 'bulk_insert')}
+
+    def stats(self):
+        """Return a copy of the counters and latency histograms."""
+        result = dict(self._counters)
+        result['delete_cases'] = dict(sorted(self._delete_cases.items()))
+        result['latency_ns'] = {operation: {2 ** bucket: count for bucket, count in sorted(histogram.items())}
+                                for operation, histogram in self._latency.items()}
+        return result
+
+    #-------------------------- instrumented operations --------------------------
+    def search(self, element):
+        start = time.perf_counter_ns()
+        node = super().search(_CountedKey(element, self._counters))
+        if not self._in_delete:     # the search done by delete is part of the delete
+            self._record('search', start)
+        return node
+
+    def insert(self, element):
+        self._run('insert', super().insert, _CountedKey(element, self._counters))
+
+    def delete(self, element):
+        # the comparisons are counted by search, which delete calls
+        self._in_delete = True
+        try:
+            self._run('delete', super().delete, element)
+        finally:
+            self._in_delete = False
+
+    def search_many(self, keys):
+        return self._run('search_many', super().search_many, self._counted(keys))
+
+    def insert_many(self, keys):
+        self._run('insert_many', super().insert_many, self._counted(keys))
+
+    def bulk_insert(self, iterable):
+        self._run('bulk_insert', super().bulk_insert, self._counted(iterable))
+
+    def _counted(self, keys):
+        counters = self._counters
+        return [_CountedKey(key, counters) for key in keys]
+
+    # Run function(*args) with this tree's counters active in this thread and record its latency
+    def _run(self, operation, function, *args):
+        start = time.perf_counter_ns()
+        previous = getattr(_active, 'counters', None)
+        _active.counters = self._counters
+        try:
+            result = function(*args)
+        finally:
+            _active.counters = previous
+        self._record(operation, start)
+        return result
+
+    def _record(self, operation, start):
+        if self._record_latency:
+            self._latency[operation][self._bucket(start)] += 1
+
+    def _bucket(self, start):
+        return max(time.perf_counter_ns() - start, 1).bit_length() - 1
+
+    #-------------------------- hooks --------------------------
+    def _fix_insert(self, node):
+        # the new node still holds the wrapped key: store the plain element
+        if isinstance(node._element, _CountedKey):
+            node._element = node._element.value
+        return super()._fix_insert(node)
+
+    # insert_many / bulk_insert may rebuild from the wrapped keys
+    def _build_from_sorted(self, elements):
+        super()._build_from_sorted([element.value if isinstance(element, _CountedKey) else element
+                                    for element in elements])
+
+    def _rotate_left(self, node):
+        self._counters['rotations'] += 1
+        super()._rotate_left(node)
+
+    def _rotate_right(self, node):
+        self._counters['rotations'] += 1
+        super()._rotate_right(node)
+
+    def _delete_case1(self, node):
+        self._delete_cases[1] += 1
+        super()._delete_case1(node)
+
+    def _delete_case2(self, node):
+        self._delete_cases[2] += 1
+        super()._delete_case2(node)
+
+    def _delete_case3(self, node):
+        self._delete_cases[3] += 1
+        super()._delete_case3(node)
+
+    def _delete_case4(self, node):
+        self._delete_cases[4] += 1
+        super()._delete_case4(node)
+
+    def _delete_case5(self, node):
+        self._delete_cases[5] += 1
+        super()._delete_case5(node)
+
+    def _delete_case6(self, node):
+        self._delete_cases[6] += 1
+        super()._delete_case6(node)
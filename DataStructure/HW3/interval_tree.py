@@ -0,0 +1,234 @@
+from array import array
+
+from redblack_tree import RedBlackTree
+
+class IntervalTree(RedBlackTree):
+    """Interval tree on top of the red-black tree.
+
+    Each node holds a closed interval [lo, hi]: lo is the node's _element (the
+    ordering key) and hi is kept in _high. _max is the largest hi in the node's
+    subtree and is kept correct through insert, delete, the rotations and joins.
+    Iteration yields (lo, hi) tuples in order of lo.
+    """
+
+    class _Node(RedBlackTree._Node):
+        """Node with the upper end of its interval and the max upper end of its subtree."""
+        __slots__ = '_high', '_max'
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED, high=None):
+            super().__init__(element, parent, left, right, color)
+            self._high = high
+            self._max = high
+
+    #-------------------------- updates --------------------------
+    def insert(self, interval):
+        lo, hi = interval
+        if hi < lo:
+            raise ValueError('interval must have lo <= hi')
+        node = self._Node(lo, high=hi)
+        if self._root is None:
+            self._root = node
+        else:
+            parent_node = None
+            current_node = self._root
+            while current_node is not None:
+                parent_node = current_node
+                if lo < current_node._element:
+                    current_node = current_node._left
+                else:
+                    current_node = current_node._right
+            node._parent = parent_node
+            if lo < parent_node._element:
+                parent_node._left = node
+            else:
+                parent_node._right = node
+        self._resize(1)
+        self._fix_insert(node)
+
+    def insert_many(self, intervals):
+        for interval in intervals:
+            self.insert(interval)
+
+    def delete(self, interval):
+        """Remove one interval equal to (lo, hi), if there is one."""
+        node = self._find(interval)
+        if node is not None:
+            self._delete_node(node)
+
+    def __contains__(self, interval):
+        return self._find(interval) is not None
+
+    #-------------------------- queries --------------------------
+    def overlapping(self, a, b):
+        """Generate the intervals overlapping [a, b], in order of lo.
+
+        Only subtrees whose _max reaches a are entered, and the walk stops at the
+        first lo greater than b.
+        """
+        stack = []
+        node = self._root
+        while True:
+            if node is not None and not node._max < a:
+                stack.append(node)
+                node = node._left
+            elif stack:
+                node = stack.pop()
+                if node._element > b:
+                    return          # every later interval starts after b
+                if not node._high < a:
+                    yield (node._element, node._high)
+                node = node._right
+            else:
+                return
+
+    def stab(self, point):
+        """Generate the intervals containing point."""
+        return self.overlapping(point, point)
+
+    def __iter__(self):
+        node = self._first_node(self._root)
+        while node is not None:
+            yield (node._element, node._high)
+            node = self._next_node(node)
+
+    def __reversed__(self):
+        node = self._last_node(self._root)
+        while node is not None:
+            yield (node._element, node._high)
+            node = self._prev_node(node)
+
+    def inorder_traverse(self):
+        return list(self)
+
+    # Intervals whose lo is between lo and hi (see RedBlackTree.irange)
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        for node in self._irange_nodes(lo, hi, inclusive, reverse):
+            yield (node._element, node._high)
+
+    #-------------------------- set operations --------------------------
+    # The inherited split / join recursions match nodes on lo alone, which would
+    # treat [1, 2] and [1, 9] as the same interval. Here both trees are turned into
+    # sorted lists of distinct (lo, hi) intervals, merged, and the result is built
+    # in O(n) from the merge (O(n log n) overall for the sorting). Both trees are
+    # consumed, like RedBlackTree.union.
+    def union(self, other):
+        return self._merge_intervals(other, True, True, True)
+
+    def intersection(self, other):
+        return self._merge_intervals(other, False, False, True)
+
+    def difference(self, other):
+        return self._merge_intervals(other, True, False, False)
+
+    # Keep an interval only in self, only in other, or in both, as the flags say
+    def _merge_intervals(self, other, keep_self, keep_other, keep_both):
+        self._check_compatible(other)
+        a = self._distinct_intervals()
+        b = other._distinct_intervals()
+        merged = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i] < b[j]:
+                if keep_self:
+                    merged.append(a[i])
+                i += 1
+            elif b[j] < a[i]:
+                if keep_other:
+                    merged.append(b[j])
+                j += 1
+            else:
+                if keep_both:
+                    merged.append(a[i])
+                i += 1
+                j += 1
+        if keep_self:
+            merged.extend(a[i:])
+        if keep_other:
+            merged.extend(b[j:])
+        tree = self._empty_like()
+        tree._build_from_sorted(merged)
+        self._root, self._size = None, 0
+        other._root, other._size = None, 0
+        return tree
+
+    def _distinct_intervals(self):
+        intervals = sorted(self)      # equal lo are in insertion order, not by hi
+        return [interval for k, interval in enumerate(intervals)
+                if k == 0 or intervals[k-1] != interval]
+
+    def _find(self, interval):
+        lo, hi = interval
+        node = self._lower_node(lo)
+        while node is not None and not lo < node._element:
+            if node._high == hi:
+                return node
+            node = self._next_node(node)
+        return None
+
+    #-------------------------- keeping _max correct --------------------------
+    def _update_max(self, node):
+        best = node._high
+        for child in (node._left, node._right):
+            if child is not None and child._max is not None and (best is None or child._max > best):
+                best = child._max
+        node._max = best
+
+    # Snapshots store hi next to lo; _max is recomputed children first (reverse preorder)
+    def _dump_payload(self, nodes, typecode):
+        highs = [node._high for node in nodes]
+        return array('q' if all(isinstance(high, int) for high in highs) else 'd', highs)
+
+    def _load_payload(self, nodes, payload):
+        if payload is None and nodes:
+            raise ValueError('snapshot has no interval upper ends')
+        for node, high in zip(nodes, payload.tolist() if payload is not None else ()):
+            node._high = high
+        for node in reversed(nodes):
+            self._update_max(node)
+
+    def _build_subtree(self, elements, lo, hi, parent, depth, red_depth):
+        node = super()._build_subtree(elements, lo, hi, parent, depth, red_depth)
+        if node is not None:
+            node._element, node._high = node._element     # split the (lo, hi) interval
+            self._update_max(node)                        # children are already built
+        return node
+
+    def _fix_insert(self, node):
+        # node was just attached (a new leaf, or a subtree hung by a join)
+        current = node
+        while current is not None:
+            self._update_max(current)
+            current = current._parent
+        return super()._fix_insert(node)
+
+    def _delete_node(self, node):
+        if node._left is not None and node._right is not None:
+            # Move the successor's whole interval
+            successor = self._successor(node)
+            node._element = successor._element
+            node._high = successor._high
+            node = successor
+        self._remove_node(node)
+
+    def _remove_node(self, node):
+        # Node is about to be unlinked: it stops counting for the maxima on its path,
+        # also while the delete cases rotate around it
+        high = node._high
+        node._high = None
+        current = node
+        while current is not None:
+            self._update_max(current)
+            current = current._parent
+        super()._remove_node(node)
+        node._high = high           # the node may be reused (join takes it as the middle)
+        node._max = high
+
+    def _rotate_left(self, node):
+        super()._rotate_left(node)
+        self._update_max(node)
+        self._update_max(node._parent)
+
+    def _rotate_right(self, node):
+        super()._rotate_right(node)
+        self._update_max(node)
+        self._update_max(node._parent)
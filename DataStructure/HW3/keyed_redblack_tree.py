@@ -0,0 +1,137 @@
+import heapq
+
+from redblack_tree import RedBlackTree
+
+class KeyedRedBlackTree(RedBlackTree):
+    """Red-black tree ordered by key(item), like sorted(items, key=key).
+
+    key is called once per item, when it is inserted. The result is cached in the
+    node's _element, and the item itself goes in a separate _item slot. Every
+    descent (search, insert, delete, irange, split ...) then compares the cached
+    keys directly, with no attribute lookups or Python-level __lt__ calls on the items.
+    search / delete / irange take keys; iteration yields the items.
+    """
+
+    class _Node(RedBlackTree._Node):
+        """Node with an extra slot for the item (the key is in _element)."""
+        __slots__ = '_item',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED, item=None):
+            super().__init__(element, parent, left, right, color)
+            self._item = item
+
+    def __init__(self, key=None):
+        """Create an empty tree; key=None orders the items themselves."""
+        super().__init__()
+        self._key = key
+
+    def key_of(self, item):
+        return item if self._key is None else self._key(item)
+
+    # split / join / set operations keep the key function
+    def _empty_like(self):
+        return self.__class__(self._key)
+
+    def _check_compatible(self, other):
+        if getattr(other, '_key', None) is not self._key:
+            raise ValueError('trees must use the same key function')
+
+    #-------------------------- constructors --------------------------
+    # Build from items already sorted by key, in O(n)
+    @classmethod
+    def from_sorted(cls, items, key=None):
+        tree = cls(key)
+        pairs = [(tree.key_of(item), item) for item in items]
+        for i in range(1, len(pairs)):
+            if pairs[i][0] < pairs[i-1][0]:
+                raise ValueError('input must be sorted by key')
+        tree._build_from_sorted(pairs)
+        return tree
+
+    def bulk_insert(self, items):
+        new_pairs = sorted(((self.key_of(item), item) for item in items), key=lambda pair: pair[0])
+        if not new_pairs:
+            return
+        merged = list(heapq.merge(self._iter_pairs(), new_pairs, key=lambda pair: pair[0]))
+        self._build_from_sorted(merged)
+
+    def _build_subtree(self, elements, lo, hi, parent, depth, red_depth):
+        node = super()._build_subtree(elements, lo, hi, parent, depth, red_depth)
+        if node is not None:
+            node._element, node._item = node._element     # split the (key, item) pair
+        return node
+
+    # Items are arbitrary objects, which the fixed-width snapshot format cannot hold
+    def _dump_payload(self, nodes, typecode):
+        raise TypeError('KeyedRedBlackTree cannot be dumped: snapshots only hold the keys')
+
+    def _load_payload(self, nodes, payload):
+        raise TypeError('KeyedRedBlackTree cannot be loaded from a snapshot: it only holds the keys')
+
+    #-------------------------- updates --------------------------
+    def insert(self, item):
+        key = self.key_of(item)     # the only call of key for this item
+        node = self._Node(key, item=item)
+        if self._root is None:
+            self._root = node
+        else:
+            parent_node = None
+            current_node = self._root
+            while current_node is not None:
+                parent_node = current_node
+                if key < current_node._element:
+                    current_node = current_node._left
+                else:
+                    current_node = current_node._right
+            node._parent = parent_node
+            if key < parent_node._element:
+                parent_node._left = node
+            else:
+                parent_node._right = node
+        self._resize(1)
+        self._fix_insert(node)
+
+    def insert_many(self, items):
+        for item in items:
+            self.insert(item)
+
+    def _delete_node(self, node):
+        if node._left is not None and node._right is not None:
+            # Move both the key and the item of the successor
+            successor = self._successor(node)
+            node._element = successor._element
+            node._item = successor._item
+            node = successor
+        self._remove_node(node)
+
+    #-------------------------- lookups and iteration --------------------------
+    def find(self, key, default=None):
+        """Return an item with the given key, or default."""
+        node = self.search(key)
+        return node._item if node is not None else default
+
+    def __iter__(self):
+        node = self._first_node(self._root)
+        while node is not None:
+            yield node._item
+            node = self._next_node(node)
+
+    def __reversed__(self):
+        node = self._last_node(self._root)
+        while node is not None:
+            yield node._item
+            node = self._prev_node(node)
+
+    def inorder_traverse(self):
+        return list(self)
+
+    # Items whose key is between lo and hi, in key order (see RedBlackTree.irange)
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        for node in self._irange_nodes(lo, hi, inclusive, reverse):
+            yield node._item
+
+    def _iter_pairs(self):
+        node = self._first_node(self._root)
+        while node is not None:
+            yield node._element, node._item
+            node = self._next_node(node)
@@ -0,0 +1,88 @@
+import mmap
+
+from redblack_tree import RedBlackTree
+
+class MappedRedBlackTree():
+    """Read-only red-black tree served straight from a file written by RedBlackTree.dump.
+
+    The file is memory-mapped and searched in place: a node is its preorder index,
+    and no _Node objects are created, so opening even a large snapshot is instant
+    and the pages are shared with other processes mapping the same file.
+    Use RedBlackTree.load(path, mmap=False) to get a tree that can be modified.
+    """
+    NIL = -1                    # id used for "no node"
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (self._typecode, self._size, self._element,
+         self._right, self._flags, self._payload) = RedBlackTree._snapshot_arrays(self._map)
+        if self._payload is not None:
+            # counts, interval ends ...: searching the keys alone would give wrong answers
+            self.close()
+            raise ValueError('snapshot has per-node data; load it with mmap=False from the class that dumped it')
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        # the memoryviews must be released before the map can be closed
+        if self._map is not None:
+            for view in (self._element, self._right, self._flags, self._payload):
+                if view is not None:
+                    view.release()
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Search for the element.
+    # return: node id, or None if it's non-existing
+    def search(self, element):
+        elements = self._element
+        right = self._right
+        flags = self._flags
+        has_left = RedBlackTree._FLAG_LEFT
+        node = 0 if self._size else -1
+        while node != -1:
+            current = elements[node]
+            if element < current:
+                node = node + 1 if flags[node] & has_left else -1
+            elif element > current:
+                node = right[node]
+            else:
+                return node
+        return None
+
+    def __contains__(self, element):
+        return self.search(element) is not None
+
+    def element(self, node):
+        """Return the element stored at node id."""
+        return self._element[node]
+
+    def is_red(self, node):
+        return bool(self._flags[node] & RedBlackTree._FLAG_RED)
+
+    def __iter__(self):
+        elements = self._element
+        right = self._right
+        flags = self._flags
+        has_left = RedBlackTree._FLAG_LEFT
+        stack = []
+        node = 0 if self._size else -1
+        while stack or node != -1:
+            if node != -1:
+                stack.append(node)
+                node = node + 1 if flags[node] & has_left else -1
+            else:
+                node = stack.pop()
+                yield elements[node]
+                node = right[node]
+
+    def inorder_traverse(self):
+        return list(self)
@@ -0,0 +1,231 @@
+from array import array
+
+from redblack_tree import RedBlackTree
+
+class MultisetRedBlackTree(RedBlackTree):
+    """Red-black tree that stores each distinct element once, with a count.
+
+    Inserting an element that is already there only bumps its count, and delete
+    only decrements it, so heavy duplication does not make the tree taller.
+    len() is the total number of copies (O(1)), count(x) is O(log n).
+    join merges equal boundary elements into one node, and the set operations
+    combine counts like collections.Counter: union keeps the larger count,
+    intersection the smaller one and difference subtracts.
+    """
+
+    class _Node(RedBlackTree._Node):
+        """Node with a count of equal elements."""
+        __slots__ = '_count',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED, count=1):
+            super().__init__(element, parent, left, right, color)
+            self._count = count
+
+    def __init__(self):
+        super().__init__()
+        self._distinct = 0      # number of nodes; None while unknown, like _size
+
+    def insert(self, element):
+        parent_node = None
+        current_node = self._root
+        while current_node is not None:
+            if element < current_node._element:
+                parent_node, current_node = current_node, current_node._left
+            elif element > current_node._element:
+                parent_node, current_node = current_node, current_node._right
+            else:
+                # already there: one more copy, no new node
+                current_node._count += 1
+                self._resize(1)
+                return
+        node = self._Node(element, parent_node)
+        if parent_node is None:
+            self._root = node
+        elif element < parent_node._element:
+            parent_node._left = node
+        else:
+            parent_node._right = node
+        self._resize(1)
+        self._resize_distinct(1)
+        self._fix_insert(node)
+
+    def insert_many(self, elements):
+        for element in elements:
+            self.insert(element)
+
+    def delete(self, element):
+        """Remove one copy of element."""
+        node = self.search(element)
+        if node is None:
+            return
+        if node._count > 1:
+            node._count -= 1
+            self._resize(-1)
+        else:
+            self._delete_node(node)
+
+    def count(self, element):
+        """Number of copies of element."""
+        node = self.search(element)
+        return node._count if node is not None else 0
+
+    def distinct_len(self):
+        """Number of distinct elements (= number of nodes)."""
+        if self._distinct is None:
+            self._distinct = super()._subtree_size(self._root)
+        return self._distinct
+
+    def items(self):
+        """Generate (element, count) pairs in sorted order."""
+        node = self._first_node(self._root)
+        while node is not None:
+            yield node._element, node._count
+            node = self._next_node(node)
+
+    # Iteration repeats each element count times, like a sorted list of all copies
+    def __iter__(self):
+        for element, count in self.items():
+            for _ in range(count):
+                yield element
+
+    def __reversed__(self):
+        node = self._last_node(self._root)
+        while node is not None:
+            for _ in range(node._count):
+                yield node._element
+            node = self._prev_node(node)
+
+    def inorder_traverse(self):
+        return list(self)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        for node in self._irange_nodes(lo, hi, inclusive, reverse):
+            for _ in range(node._count):
+                yield node._element
+
+    #-------------------------- keeping the counts correct --------------------------
+    def _delete_node(self, node):
+        removed = node._count
+        if node._left is not None and node._right is not None:
+            # Move the successor's element together with its count
+            successor = self._successor(node)
+            node._element = successor._element
+            node._count = successor._count
+            node = successor
+        self._remove_node(node)
+        # _remove_node took one off the size; the node held `removed` copies
+        self._resize(1 - removed)
+        self._resize_distinct(-1)
+
+    def _resize_distinct(self, delta):
+        if self._distinct is not None:
+            self._distinct += delta
+
+    # Sorted input is compressed into one node per run of equal elements
+    def _build_from_sorted(self, elements):
+        runs = []
+        for element in elements:
+            if runs and not runs[-1][0] < element:
+                runs[-1][1] += 1
+            else:
+                runs.append([element, 1])
+        super()._build_from_sorted(runs)
+        self._distinct = len(runs)
+        self._size = len(elements)
+
+    # Snapshots store the count of every node next to its element
+    def _dump_payload(self, nodes, typecode):
+        return array('q', [node._count for node in nodes])
+
+    def _load_payload(self, nodes, payload):
+        self._distinct = len(nodes)
+        if payload is not None:
+            for node, count in zip(nodes, payload.tolist()):
+                node._count = count
+            self._size = sum(payload.tolist())
+
+    def _build_subtree(self, elements, lo, hi, parent, depth, red_depth):
+        node = super()._build_subtree(elements, lo, hi, parent, depth, red_depth)
+        if node is not None:
+            node._element, node._count = node._element     # split the [element, count] run
+        return node
+
+    # Used by split / join and the set operations: copies, not nodes
+    def _subtree_size(self, node):
+        count = 0
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            count += node._count
+            if node._left is not None:
+                stack.append(node._left)
+            if node._right is not None:
+                stack.append(node._right)
+        return count
+
+    def _adopt(self, root, size=None):
+        super()._adopt(root, size)
+        self._distinct = 0 if root is None else None
+        return self
+
+    #-------------------------- join and set operations --------------------------
+    @classmethod
+    def join(cls, left, right):
+        """Join two multisets where every element of left is <= every element of right."""
+        if left._root is not None and right._root is not None:
+            last = left._last_node(left._root)
+            first = right._first_node(right._root)
+            if not last._element < first._element and not first._element < last._element:
+                # the same element at the boundary: one node with both counts
+                last._count += first._count
+                left._resize(first._count)
+                right._delete_node(first)
+        if left._distinct is not None and right._distinct is not None:
+            distinct = left._distinct + right._distinct
+        else:
+            distinct = None
+        tree = super().join(left, right)
+        if tree._root is not None:
+            tree._distinct = distinct
+        return tree
+
+    # Same recursions as RedBlackTree, but a matching node's count is combined
+    # instead of one of the two nodes being dropped
+    def _union_roots(self, a, a_bh, b, b_bh):
+        if a is None:
+            return b, b_bh
+        if b is None:
+            return a, a_bh
+        a_left, a_right, child_bh = self._detach_children(a, a_bh)
+        b_left, b_left_bh, match, b_right, b_right_bh = self._split_roots(b, b_bh, a._element, True)
+        if match is not None:
+            a._count = max(a._count, match._count)
+        left_root, left_bh = self._union_roots(a_left, child_bh, b_left, b_left_bh)
+        right_root, right_bh = self._union_roots(a_right, child_bh, b_right, b_right_bh)
+        return self._join_roots(left_root, left_bh, a, right_root, right_bh)
+
+    def _intersection_roots(self, a, a_bh, b, b_bh):
+        if a is None or b is None:
+            return None, 0
+        a_left, a_right, child_bh = self._detach_children(a, a_bh)
+        b_left, b_left_bh, match, b_right, b_right_bh = self._split_roots(b, b_bh, a._element, True)
+        left_root, left_bh = self._intersection_roots(a_left, child_bh, b_left, b_left_bh)
+        right_root, right_bh = self._intersection_roots(a_right, child_bh, b_right, b_right_bh)
+        if match is not None:
+            a._count = min(a._count, match._count)
+            return self._join_roots(left_root, left_bh, a, right_root, right_bh)
+        return self._join2_roots(left_root, left_bh, right_root, right_bh)
+
+    def _difference_roots(self, a, a_bh, b, b_bh):
+        if a is None:
+            return None, 0
+        if b is None:
+            return a, a_bh
+        b_left, b_right, child_bh = self._detach_children(b, b_bh)
+        a_left, a_left_bh, match, a_right, a_right_bh = self._split_roots(a, a_bh, b._element, True)
+        left_root, left_bh = self._difference_roots(a_left, a_left_bh, b_left, child_bh)
+        right_root, right_bh = self._difference_roots(a_right, a_right_bh, b_right, child_bh)
+        if match is not None and match._count > b._count:
+            match._count -= b._count
+            return self._join_roots(left_root, left_bh, match, right_root, right_bh)
+        return self._join2_roots(left_root, left_bh, right_root, right_bh)
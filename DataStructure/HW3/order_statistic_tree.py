@@ -0,0 +1,100 @@
+from redblack_tree import RedBlackTree
+
+class OrderStatisticTree(RedBlackTree):
+    """Red-black tree where every node also stores the size of its subtree.
+
+    rank, select and count_range run in O(log n).
+    """
+
+    class _Node(RedBlackTree._Node):
+        """Node with an extra subtree-size field."""
+        __slots__ = '_size',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED):
+            super().__init__(element, parent, left, right, color)
+            self._size = 1
+
+    def _subtree_size(self, node):
+        return node._size if node is not None else 0
+
+    # load() links the nodes with _size = 1: recount them children first (reverse preorder)
+    def _load_payload(self, nodes, payload):
+        for node in reversed(nodes):
+            node._size = self._subtree_size(node._left) + self._subtree_size(node._right) + 1
+
+    # Number of elements smaller than x (same as bisect_left on the in-order list)
+    def rank(self, x):
+        return self._count_before(x, False)
+
+    # i-th smallest element (0-based), negative i counts from the end like a list
+    def select(self, i):
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError('select index out of range')
+        node = self._root
+        while True:
+            left_size = self._subtree_size(node._left)
+            if i < left_size:
+                node = node._left
+            elif i == left_size:
+                return node._element
+            else:
+                i -= left_size + 1
+                node = node._right
+
+    # Number of elements between lo and hi (inclusive by default)
+    def count_range(self, lo, hi, inclusive=(True, True)):
+        lo_inclusive, hi_inclusive = inclusive
+        count = self._count_before(hi, hi_inclusive) - self._count_before(lo, not lo_inclusive)
+        return max(count, 0)
+
+    # Number of elements < x, or <= x when or_equal is True
+    def _count_before(self, x, or_equal):
+        count = 0
+        node = self._root
+        while node is not None:
+            if node._element < x or (or_equal and not node._element > x):
+                count += self._subtree_size(node._left) + 1
+                node = node._right
+            else:
+                node = node._left
+        return count
+
+    #-------------------------- keeping the sizes correct --------------------------
+    def _build_subtree(self, elements, lo, hi, parent, depth, red_depth):
+        node = super()._build_subtree(elements, lo, hi, parent, depth, red_depth)
+        if node is not None:
+            node._size = hi - lo
+        return node
+
+    def _fix_insert(self, node):
+        # node was just attached (a new leaf, or a subtree hung by a join):
+        # recount it and every ancestor from their children
+        current = node
+        while current is not None:
+            current._size = self._subtree_size(current._left) + self._subtree_size(current._right) + 1
+            current = current._parent
+        return super()._fix_insert(node)
+
+    def _remove_node(self, node):
+        # Node is about to be unlinked: it and every ancestor lose one element.
+        # The node counts as 0 while the delete cases rotate around it.
+        current = node
+        while current is not None:
+            current._size -= 1
+            current = current._parent
+        super()._remove_node(node)
+
+    def _rotate_left(self, node):
+        super()._rotate_left(node)
+        self._update_rotated_sizes(node)
+
+    def _rotate_right(self, node):
+        super()._rotate_right(node)
+        self._update_rotated_sizes(node)
+
+    def _update_rotated_sizes(self, node):
+        # node moved down below its new parent, which now covers node's old subtree
+        node._parent._size = node._size
+        node._size = self._subtree_size(node._left) + self._subtree_size(node._right) + 1
@@ -0,0 +1,357 @@
+class RedBlackSnapshot():
+    """Read-only red-black tree, as returned by PersistentRedBlackTree.snapshot().
+
+    Nodes reachable from a snapshot are never modified again, so any number of
+    threads can search and iterate it without locking while the writer goes on.
+    """
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node:
+        RED = object()
+        BLACK = object()
+        """Lightweight, nonpublic class for storing a node (no parent link)."""
+        __slots__ = '_element', '_left', '_right', '_color', '_epoch'
+
+        def __init__(self, element, left=None, right=None, color=RED, epoch=0):
+            self._element = element
+            self._left = left
+            self._right = right
+            self._color = color
+            self._epoch = epoch  # version that is allowed to modify this node
+
+    def __init__(self, root=None, size=0):
+        self._root = root
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, element):
+        return self.search(element) is not None
+
+    # Search for the element.
+    # return: _Node object, or None if it's non-existing
+    def search(self, element):
+        node = self._root
+        while node is not None:
+            if element < node._element:
+                node = node._left
+            elif element > node._element:
+                node = node._right
+            else:
+                return node
+        return None
+
+    # In-order iteration; there are no parent links, so an O(log n) stack is used
+    def __iter__(self):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node._left
+            else:
+                node = stack.pop()
+                yield node._element
+                node = node._right
+
+    def __reversed__(self):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node._right
+            else:
+                node = stack.pop()
+                yield node._element
+                node = node._left
+
+    # Generate the elements with lo <= element <= hi (None means no bound)
+    def irange(self, lo=None, hi=None):
+        stack = []
+        node = self._root
+        while node is not None:
+            # only keep the nodes >= lo on the stack
+            if lo is None or not node._element < lo:
+                stack.append(node)
+                node = node._left
+            else:
+                node = node._right
+        while stack:
+            node = stack.pop()
+            if hi is not None and node._element > hi:
+                return
+            yield node._element
+            node = node._right
+            while node is not None:
+                stack.append(node)
+                node = node._left
+
+    def inorder_traverse(self):
+        return list(self)
+
+    def _is_black(self, node):
+        return node is None or node._color == self._Node.BLACK
+
+    def check_tree_property_silent(self):
+        if self._root is None:
+            return True
+        if not self._root._color == self._Node.BLACK:
+            print('Root black property is violated')
+            return False
+        return self._check_subtree(self._root, None, None) != 0
+
+    # Check BST order, double red and black height; return the black height or 0 on error
+    def _check_subtree(self, node, lo, hi):
+        if node is None:
+            return 1
+        if (lo is not None and node._element < lo) or (hi is not None and node._element > hi):
+            print('Binary search tree property error - ', node._element)
+            return 0
+        if node._color == self._Node.RED and not (self._is_black(node._left) and self._is_black(node._right)):
+            print('Double red property error - ', node._element)
+            return 0
+        left_height = self._check_subtree(node._left, lo, node._element)
+        right_height = self._check_subtree(node._right, node._element, hi)
+        if left_height == 0 or left_height != right_height:
+            print('Black height property error - ', node._element, left_height, right_height)
+            return 0
+        return left_height + (1 if node._color == self._Node.BLACK else 0)
+
+
+class PersistentRedBlackTree(RedBlackSnapshot):
+    """Red-black tree with O(1) snapshots, by path copying (copy-on-write).
+
+    Every node remembers the epoch that created it. snapshot() starts a new epoch,
+    and from then on insert/delete copy a node of an older epoch before changing it,
+    so the snapshot keeps seeing its own version. Only the O(log n) nodes on the
+    changed paths are copied; everything else is shared between versions.
+    Without a snapshot in between, nodes are simply modified in place.
+    """
+
+    def __init__(self):
+        """Create an initially empty tree."""
+        super().__init__()
+        self._epoch = 0
+
+    def snapshot(self):
+        """Return an immutable view of the current version in O(1).
+
+        Call it from the writer (it starts a new epoch), then hand the view to readers.
+        """
+        self._epoch += 1
+        return RedBlackSnapshot(self._root, self._size)
+
+    def insert(self, element):
+        node = self._Node(element, epoch=self._epoch)
+        self._size += 1
+        if self._root is None:
+            node._color = self._Node.BLACK
+            self._root = node
+            return
+        # Descend, copying every ancestor so that it can be modified
+        current = self._root = self._writable(self._root)
+        path = []
+        while True:
+            path.append(current)
+            if element < current._element:
+                if current._left is None:
+                    current._left = node
+                    break
+                current._left = self._writable(current._left)
+                current = current._left
+            else:
+                if current._right is None:
+                    current._right = node
+                    break
+                current._right = self._writable(current._right)
+                current = current._right
+        self._fix_insert(node, path)
+
+    def delete(self, element):
+        if self.search(element) is None:
+            return
+        # Descend to the node, copying the path
+        node = self._root = self._writable(self._root)
+        path = []
+        while element < node._element or element > node._element:
+            path.append(node)
+            if element < node._element:
+                node._left = self._writable(node._left)
+                node = node._left
+            else:
+                node._right = self._writable(node._right)
+                node = node._right
+
+        if node._left is not None and node._right is not None:
+            # Case 1 : node has two children -> take the successor's element
+            target = node
+            path.append(node)
+            node._right = self._writable(node._right)
+            node = node._right
+            while node._left is not None:
+                path.append(node)
+                node._left = self._writable(node._left)
+                node = node._left
+            target._element = node._element
+
+        # node has at most one child now
+        child = node._left if node._left is not None else node._right
+        parent = path[-1] if path else None
+        is_left = parent is not None and parent._left is node
+        self._size -= 1
+        if node._color == self._Node.RED:
+            self._relink(parent, node, child)
+        elif child is not None and child._color == self._Node.RED:
+            # Case 2 : node is BLACK, and its child is RED
+            child = self._writable(child)
+            child._color = self._Node.BLACK
+            self._relink(parent, node, child)
+        else:
+            # Case 3 : node is BLACK, and the child is None -> fix the missing black
+            self._relink(parent, node, child)
+            self._fix_delete(child, path, is_left)
+
+    #-------------------------- copy-on-write utilities --------------------------
+    # Return a node that may be modified: node itself if it belongs to this epoch,
+    # otherwise a copy (the caller links the copy into its already writable parent)
+    def _writable(self, node):
+        if node._epoch == self._epoch:
+            return node
+        return self._Node(node._element, node._left, node._right, node._color, self._epoch)
+
+    def _relink(self, parent, old, new):
+        if parent is None:
+            self._root = new
+        elif parent._left is old:
+            parent._left = new
+        else:
+            parent._right = new
+
+    # Rotations only touch nodes that are already writable
+    def _rotate_left(self, node, parent):
+        y = node._right
+        node._right = y._left
+        y._left = node
+        self._relink(parent, node, y)
+
+    def _rotate_right(self, node, parent):
+        y = node._left
+        node._left = y._right
+        y._right = node
+        self._relink(parent, node, y)
+
+    #-------------------------- rebalancing (path holds the ancestors) --------------------------
+    def _fix_insert(self, node, path):
+        RED = self._Node.RED
+        BLACK = self._Node.BLACK
+        while path and path[-1]._color == RED:
+            parent = path.pop()
+            grand = path.pop()     # parent is RED, so it is not the root
+            great = path[-1] if path else None
+            if parent is grand._left:
+                uncle = grand._right
+                if uncle is not None and uncle._color == RED:
+                    # Case 1 : uncle is RED -> recolor and move up
+                    uncle = grand._right = self._writable(uncle)
+                    parent._color = BLACK
+                    uncle._color = BLACK
+                    grand._color = RED
+                    node = grand
+                    continue
+                if node is parent._right:
+                    # Case 2 : node is the inner child -> rotate it outside
+                    self._rotate_left(parent, grand)
+                    parent = node
+                # Case 3 : node is the outer child -> rotate the grandparent
+                parent._color = BLACK
+                grand._color = RED
+                self._rotate_right(grand, great)
+            else:
+                # symmetric to the above cases
+                uncle = grand._left
+                if uncle is not None and uncle._color == RED:
+                    uncle = grand._left = self._writable(uncle)
+                    parent._color = BLACK
+                    uncle._color = BLACK
+                    grand._color = RED
+                    node = grand
+                    continue
+                if node is parent._left:
+                    self._rotate_right(parent, grand)
+                    parent = node
+                parent._color = BLACK
+                grand._color = RED
+                self._rotate_left(grand, great)
+            break
+        self._root._color = BLACK
+
+    # x (maybe None) is one black short; its parent is path[-1] and is_left tells the side
+    def _fix_delete(self, x, path, is_left):
+        RED = self._Node.RED
+        BLACK = self._Node.BLACK
+        while path and self._is_black(x):
+            parent = path[-1]
+            grand = path[-2] if len(path) > 1 else None
+            if is_left:
+                sibling = parent._right = self._writable(parent._right)
+                if sibling._color == RED:
+                    # sibling is RED -> rotate so that the new sibling is BLACK
+                    sibling._color = BLACK
+                    parent._color = RED
+                    self._rotate_left(parent, grand)
+                    path[-1:] = [sibling, parent]
+                    grand = sibling
+                    sibling = parent._right = self._writable(parent._right)
+                if self._is_black(sibling._left) and self._is_black(sibling._right):
+                    # sibling and its children are BLACK -> push the problem up
+                    sibling._color = RED
+                    x = path.pop()
+                    if path:
+                        is_left = path[-1]._left is x
+                    continue
+                if self._is_black(sibling._right):
+                    # only the inner nephew is RED -> rotate it outside
+                    nephew = sibling._left = self._writable(sibling._left)
+                    nephew._color = BLACK
+                    sibling._color = RED
+                    self._rotate_right(sibling, parent)
+                    sibling = nephew
+                # outer nephew is RED -> rotate the parent, done
+                far = sibling._right = self._writable(sibling._right)
+                sibling._color = parent._color
+                parent._color = BLACK
+                far._color = BLACK
+                self._rotate_left(parent, grand)
+            else:
+                # symmetric to the above cases
+                sibling = parent._left = self._writable(parent._left)
+                if sibling._color == RED:
+                    sibling._color = BLACK
+                    parent._color = RED
+                    self._rotate_right(parent, grand)
+                    path[-1:] = [sibling, parent]
+                    grand = sibling
+                    sibling = parent._left = self._writable(parent._left)
+                if self._is_black(sibling._left) and self._is_black(sibling._right):
+                    sibling._color = RED
+                    x = path.pop()
+                    if path:
+                        is_left = path[-1]._left is x
+                    continue
+                if self._is_black(sibling._left):
+                    nephew = sibling._right = self._writable(sibling._right)
+                    nephew._color = BLACK
+                    sibling._color = RED
+                    self._rotate_left(sibling, parent)
+                    sibling = nephew
+                far = sibling._left = self._writable(sibling._left)
+                sibling._color = parent._color
+                parent._color = BLACK
+                far._color = BLACK
+                self._rotate_right(parent, grand)
+            return
+        # x is either None, BLACK, or a RED node taken from the (writable) path
+        if x is not None and x._color == RED:
+            x._color = BLACK
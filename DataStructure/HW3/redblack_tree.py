@@ -1,3 +1,12 @@
+from array import array
+import heapq
+import struct
+import sys
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class RedBlackTree():
     # Node class - DO NOT MODIFY
     class _Node:
@@ -18,9 +27,68 @@ class RedBlackTree():
         self._root = None
         self._size = 0
 
+    # _size is None while the size is unknown (after split / join / set operations,
+    # which would need an O(n) count); len() counts the nodes once and caches it.
     def __len__(self):
+        if self._size is None:
+            self._size = self._subtree_size(self._root)
         return self._size
 
+    # Add delta to the size, if it is known
+    def _resize(self, delta):
+        if self._size is not None:
+            self._size += delta
+
+    # Build a tree from already sorted elements in O(n), without any _fix_insert.
+    # The middle element becomes the root, so the shape is as balanced as possible;
+    # every node is BLACK except the deepest level, which is RED when it is incomplete.
+    @classmethod
+    def from_sorted(cls, iterable):
+        tree = cls()
+        elements = list(iterable)
+        for i in range(1, len(elements)):
+            if elements[i] < elements[i-1]:
+                raise ValueError('input must be sorted')
+        tree._build_from_sorted(elements)
+        return tree
+
+    # Insert many elements at once: sort the new ones, merge them with the
+    # current in-order sequence, and rebuild the whole tree in linear time.
+    def bulk_insert(self, iterable):
+        new_elements = sorted(iterable)
+        if not new_elements:
+            return
+        merged = list(heapq.merge(self.inorder_traverse(), new_elements))
+        self._build_from_sorted(merged)
+
+    def _build_from_sorted(self, elements):
+        n = len(elements)
+        self._size = n
+        if n == 0:
+            self._root = None
+            return
+        # Depth of the deepest level; it is only full when n == 2^(h+1) - 1.
+        max_depth = n.bit_length() - 1
+        if n == (1 << (max_depth + 1)) - 1:
+            red_depth = -1
+        else:
+            red_depth = max_depth
+        self._root = self._build_subtree(elements, 0, n, None, 0, red_depth)
+
+    def _build_subtree(self, elements, lo, hi, parent, depth, red_depth):
+        # Build the subtree holding elements[lo:hi] (recursion depth is only O(log n))
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        if depth == red_depth:
+            color = self._Node.RED
+        else:
+            color = self._Node.BLACK
+        node = self._Node(elements[mid], parent, color=color)
+        node._left = self._build_subtree(elements, lo, mid, node, depth+1, red_depth)
+        node._right = self._build_subtree(elements, mid+1, hi, node, depth+1, red_depth)
+        return node
+
     # Search for the element in the red-black tree.
     # return: _Node object, or None if it's non-existing
     def search(self, element):
@@ -57,20 +125,25 @@ class RedBlackTree():
                 parent_node._left = node
             else:
                 parent_node._right = node
-        self._size += 1
+        self._resize(1)
         self._fix_insert(node)
 
     def delete(self, element):
         node = self.search(element)
         if node is None:
             return
+        self._delete_node(node)
 
+    def _delete_node(self, node):
         if node._left is not None and node._right is not None:
             # Case 1 : node has two children
             successor = self._successor(node)
             node._element = successor._element
             node = successor
+        self._remove_node(node)
 
+    # Unlink a node that has at most one child, and rebalance
+    def _remove_node(self, node):
         leaf = node._right or node._left  # Get the non-None child node if it exists, otherwise, it's a leaf node
 
         if node._color == self._Node.RED:
@@ -85,10 +158,535 @@ class RedBlackTree():
                 self._delete_case1(node)
                 self._replace_node(node, leaf)
 
-        self._size -= 1
+        self._resize(-1)
+
+    # In-order iteration of the elements.
+    # Walks parent pointers, so it needs no stack and no intermediate list.
+    def __iter__(self):
+        node = self._first_node(self._root)
+        while node is not None:
+            yield node._element
+            node = self._next_node(node)
+
+    def __reversed__(self):
+        node = self._last_node(self._root)
+        while node is not None:
+            yield node._element
+            node = self._prev_node(node)
+
+    # Generate the elements between lo and hi in sorted order (or reversed order).
+    # lo / hi can be None for an open end, inclusive tells whether each end is included.
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        for node in self._irange_nodes(lo, hi, inclusive, reverse):
+            yield node._element
+
+    def _irange_nodes(self, lo, hi, inclusive, reverse):
+        lo_inclusive, hi_inclusive = inclusive
+        if reverse:
+            node = self._upper_node(hi, hi_inclusive)
+            while node is not None:
+                if lo is not None and (node._element < lo or
+                                       (not lo_inclusive and not lo < node._element)):
+                    return
+                yield node
+                node = self._prev_node(node)
+        else:
+            node = self._lower_node(lo, lo_inclusive)
+            while node is not None:
+                if hi is not None and (node._element > hi or
+                                       (not hi_inclusive and not node._element < hi)):
+                    return
+                yield node
+                node = self._next_node(node)
+
+    # First node whose element is >= lo (or > lo when not inclusive)
+    def _lower_node(self, lo, inclusive=True):
+        if lo is None:
+            return self._first_node(self._root)
+        found = None
+        node = self._root
+        while node is not None:
+            if node._element > lo or (inclusive and not node._element < lo):
+                found = node
+                node = node._left
+            else:
+                node = node._right
+        return found
+
+    # Last node whose element is <= hi (or < hi when not inclusive)
+    def _upper_node(self, hi, inclusive=True):
+        if hi is None:
+            return self._last_node(self._root)
+        found = None
+        node = self._root
+        while node is not None:
+            if node._element < hi or (inclusive and not node._element > hi):
+                found = node
+                node = node._right
+            else:
+                node = node._left
+        return found
+
+    # Batched versions of search / insert.
+    # While the keys come in ascending order, each descent starts from the last
+    # visited node (finger search) instead of the root, so nearby keys are cheap.
+    # A key smaller than the previous one simply restarts from the root.
+    def search_many(self, keys):
+        """Return a list with the _Node (or None) of each key."""
+        results = []
+        finger = None
+        previous = None
+        for key in keys:
+            if finger is None or key < previous:
+                node = self._root
+            else:
+                node = self._finger_node(finger, key)
+            last = None
+            while node is not None:
+                last = node
+                if key < node._element:
+                    node = node._left
+                elif key > node._element:
+                    node = node._right
+                else:
+                    break
+            results.append(node)
+            finger = node if node is not None else last
+            previous = key
+        return results
+
+    def contains_many(self, keys, as_numpy=False):
+        """Return whether each key is in the tree, as a list (or NumPy bool array)."""
+        found = [node is not None for node in self.search_many(keys)]
+        if as_numpy:
+            if np is None:
+                raise ImportError('numpy is required for as_numpy=True')
+            return np.array(found, dtype=bool)
+        return found
+
+    # Insert keys one by one, starting each descent from the last inserted node while
+    # the keys ascend. An ascending batch at least twice as large as the tree is merged
+    # with it and rebuilt instead, like bulk_insert: O(n + k), and up to about twice as fast
+    # as the inserts (the rebuild creates new nodes, so earlier search results go stale).
+    # The rebuild is skipped while the size is unknown, not to count the tree for it.
+    def insert_many(self, keys):
+        keys = list(keys)
+        if (len(keys) > 1 and self._size is not None and 2 * self._size <= len(keys) and
+                all(not keys[i+1] < keys[i] for i in range(len(keys) - 1))):
+            self._build_from_sorted(list(heapq.merge(self.inorder_traverse(), keys)))
+            return
+        finger = None
+        previous = None
+        for key in keys:
+            node = self._Node(key)
+            if self._root is None:
+                self._root = node
+            else:
+                if finger is None or key < previous:
+                    current_node = self._root
+                else:
+                    current_node = self._finger_node(finger, key)
+                while current_node is not None:
+                    parent_node = current_node
+                    if key < current_node._element:
+                        current_node = current_node._left
+                    else:
+                        current_node = current_node._right
+                node._parent = parent_node
+                if key < parent_node._element:
+                    parent_node._left = node
+                else:
+                    parent_node._right = node
+            self._resize(1)
+            self._fix_insert(node)
+            finger = node
+            previous = key
+
+    # Return the lowest node on the finger's path to the root whose subtree range holds key.
+    # Climbing only passes right-child links until a left-child link gives an upper bound;
+    # the lower bound is always fine because keys are ascending.
+    def _finger_node(self, finger, key):
+        start = node = finger
+        parent = node._parent
+        while parent is not None:
+            if node is parent._left:
+                if key < parent._element:
+                    return start
+                start = parent
+            node = parent
+            parent = node._parent
+        return start
+
+
+    # Split and join.
+    # Both work on whole subtrees and only walk down one spine using the black height,
+    # so they take O(log n) structural work. The trees passed in are consumed:
+    # their nodes are reused by the result and they are left empty.
+    # The sizes of the results are left unknown and counted by the first len()
+    # (in O(1) when the nodes know their subtree size, as in OrderStatisticTree).
+    def split(self, key):
+        """Split into (tree of elements < key, tree of elements >= key)."""
+        left = self._empty_like()
+        right = self._empty_like()
+        if self._root is not None:
+            left_root, _, _, right_root, _ = left._split_roots(
+                self._root, self._black_height(self._root), key, False)
+            left._adopt(left_root)
+            right._adopt(right_root)
+            self._root = None
+            self._size = 0
+        return left, right
+
+    @classmethod
+    def join(cls, left, right):
+        """Join two trees where every element of left is <= every element of right."""
+        left._check_compatible(right)
+        if (left._root is not None and right._root is not None and
+                right._first_node(right._root)._element < left._last_node(left._root)._element):
+            raise ValueError('elements of left must not be greater than elements of right')
+        tree = left._empty_like() if isinstance(left, cls) else cls()
+        root, _ = tree._join2_roots(left._root, left._black_height(left._root),
+                                    right._root, right._black_height(right._root))
+        if left._size is not None and right._size is not None:
+            tree._adopt(root, left._size + right._size)
+        else:
+            tree._adopt(root)
+        left._root, left._size = None, 0
+        right._root, right._size = None, 0
+        return tree
+
+    # Set operations built on split / join, treating each tree as a set of distinct elements.
+    # They consume both trees, like split and join.
+    def union(self, other):
+        return self._set_operation(type(self)._union_roots, other)
+
+    def intersection(self, other):
+        return self._set_operation(type(self)._intersection_roots, other)
+
+    def difference(self, other):
+        return self._set_operation(type(self)._difference_roots, other)
+
+    def _set_operation(self, operation, other):
+        self._check_compatible(other)
+        tree = self._empty_like()
+        root, _ = operation(tree, self._root, self._black_height(self._root),
+                            other._root, other._black_height(other._root))
+        tree._adopt(root)
+        self._root, self._size = None, 0
+        other._root, other._size = None, 0
+        return tree
+
+    def _union_roots(self, a, a_bh, b, b_bh):
+        if a is None:
+            return b, b_bh
+        if b is None:
+            return a, a_bh
+        a_left, a_right, child_bh = self._detach_children(a, a_bh)
+        b_left, b_left_bh, _, b_right, b_right_bh = self._split_roots(b, b_bh, a._element, True)
+        left_root, left_bh = self._union_roots(a_left, child_bh, b_left, b_left_bh)
+        right_root, right_bh = self._union_roots(a_right, child_bh, b_right, b_right_bh)
+        return self._join_roots(left_root, left_bh, a, right_root, right_bh)
+
+    def _intersection_roots(self, a, a_bh, b, b_bh):
+        if a is None or b is None:
+            return None, 0
+        a_left, a_right, child_bh = self._detach_children(a, a_bh)
+        b_left, b_left_bh, match, b_right, b_right_bh = self._split_roots(b, b_bh, a._element, True)
+        left_root, left_bh = self._intersection_roots(a_left, child_bh, b_left, b_left_bh)
+        right_root, right_bh = self._intersection_roots(a_right, child_bh, b_right, b_right_bh)
+        if match is not None:
+            return self._join_roots(left_root, left_bh, a, right_root, right_bh)
+        return self._join2_roots(left_root, left_bh, right_root, right_bh)
+
+    def _difference_roots(self, a, a_bh, b, b_bh):
+        if a is None:
+            return None, 0
+        if b is None:
+            return a, a_bh
+        b_left, b_right, child_bh = self._detach_children(b, b_bh)
+        a_left, a_left_bh, _, a_right, a_right_bh = self._split_roots(a, a_bh, b._element, True)
+        left_root, left_bh = self._difference_roots(a_left, a_left_bh, b_left, child_bh)
+        right_root, right_bh = self._difference_roots(a_right, a_right_bh, b_right, child_bh)
+        return self._join2_roots(left_root, left_bh, right_root, right_bh)
+
+    # The helpers below work on detached subtrees (root._parent is None) given as
+    # (root, black height) pairs. self is only used as scratch space: _fix_insert,
+    # _remove_node and the rotations update self._root while they run.
+
+    # Number of BLACK nodes on a path from node down to None, node included
+    def _black_height(self, node):
+        height = 0
+        while node is not None:
+            if node._color == self._Node.BLACK:
+                height += 1
+            node = node._left
+        return height
+
+    # Number of nodes in the subtree rooted at node
+    def _subtree_size(self, node):
+        count = 0
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            count += 1
+            if node._left is not None:
+                stack.append(node._left)
+            if node._right is not None:
+                stack.append(node._right)
+        return count
+
+    # New empty tree with the same configuration as this one (subclasses with
+    # constructor arguments override this), used for the results of split / join
+    def _empty_like(self):
+        return self.__class__()
+
+    # Raise ValueError if other cannot be joined or combined with this tree
+    def _check_compatible(self, other):
+        pass
+
+    # Make root the root of this tree; size=None leaves the size to be counted by len()
+    def _adopt(self, root, size=None):
+        self._root = root
+        if root is not None:
+            root._parent = None
+            root._color = self._Node.BLACK
+        else:
+            size = 0
+        self._size = size
+        return self
+
+    def _detach_children(self, node, bh):
+        left, right = node._left, node._right
+        if left is not None:
+            left._parent = None
+        if right is not None:
+            right._parent = None
+        if node._color == self._Node.BLACK:
+            bh -= 1
+        return left, right, bh
+
+    # Join left_root, node and right_root (all of left <= node <= all of right).
+    # Walk down the spine of the taller tree to a BLACK node with the same black height
+    # as the shorter one, hang node there as RED, and repair with _fix_insert.
+    def _join_roots(self, left_root, left_bh, node, right_root, right_bh):
+        if left_root is not None and left_root._color == self._Node.RED:
+            left_root._color = self._Node.BLACK
+            left_bh += 1
+        if right_root is not None and right_root._color == self._Node.RED:
+            right_root._color = self._Node.BLACK
+            right_bh += 1
+
+        node._color = self._Node.RED
+        parent = None
+        if left_bh >= right_bh:
+            self._root = left_root
+            current, height = left_root, left_bh
+            while current is not None and (height > right_bh or current._color == self._Node.RED):
+                if current._color == self._Node.BLACK:
+                    height -= 1
+                parent, current = current, current._right
+            node._left, node._right = current, right_root
+            if parent is not None:
+                parent._right = node
+        else:
+            self._root = right_root
+            current, height = right_root, right_bh
+            while current is not None and (height > left_bh or current._color == self._Node.RED):
+                if current._color == self._Node.BLACK:
+                    height -= 1
+                parent, current = current, current._left
+            node._left, node._right = left_root, current
+            if parent is not None:
+                parent._left = node
+        node._parent = parent
+        if node._left is not None:
+            node._left._parent = node
+        if node._right is not None:
+            node._right._parent = node
+        if parent is None:
+            self._root = node
+
+        grew = self._fix_insert(node)
+        return self._root, max(left_bh, right_bh) + grew
+
+    # Join without a middle node: take the largest node of the left tree as the middle
+    def _join2_roots(self, left_root, left_bh, right_root, right_bh):
+        if left_root is None:
+            return right_root, right_bh
+        if right_root is None:
+            return left_root, left_bh
+        pivot = self._last_node(left_root)
+        self._root = left_root
+        self._remove_node(pivot)
+        left_root = self._root
+        pivot._left = pivot._right = pivot._parent = None
+        return self._join_roots(left_root, self._black_height(left_root), pivot, right_root, right_bh)
+
+    # Split the subtree at key: returns (left, left_bh, match, right, right_bh).
+    # With stop_at_equal, the first node equal to key is returned as match and kept
+    # out of both sides; otherwise match is None and equal elements go to the right.
+    def _split_roots(self, root, bh, key, stop_at_equal):
+        path = []
+        match = None
+        node, height = root, bh
+        while node is not None:
+            child_height = height - 1 if node._color == self._Node.BLACK else height
+            if stop_at_equal and not key < node._element and not node._element < key:
+                match = node
+                break
+            went_left = key < node._element if stop_at_equal else not node._element < key
+            path.append((node, went_left, child_height))
+            node = node._left if went_left else node._right
+            height = child_height
+
+        left_root = right_root = None
+        left_bh = right_bh = 0
+        if match is not None:
+            left_root, right_root, left_bh = self._detach_children(match, height)
+            right_bh = left_bh
+            match._left = match._right = match._parent = None
+
+        # Rebuild both sides bottom-up, each path node joins the side it belongs to
+        for node, went_left, child_height in reversed(path):
+            if went_left:
+                other = node._right
+                if other is not None:
+                    other._parent = None
+                right_root, right_bh = self._join_roots(right_root, right_bh, node, other, child_height)
+            else:
+                other = node._left
+                if other is not None:
+                    other._parent = None
+                left_root, left_bh = self._join_roots(other, child_height, node, left_root, left_bh)
+        return left_root, left_bh, match, right_root, right_bh
+
+    # Binary snapshots.
+    # Layout (native byte order), with every array in preorder:
+    #   header   : magic, element typecode, payload typecode (0 if none), number of nodes
+    #   elements : fixed-width keys ('q' int64, 'd' double, ...), padded to 8 bytes
+    #   right    : int64 preorder index of the right child, -1 if none
+    #   flags    : one byte per node, _FLAG_RED and _FLAG_LEFT (the left child is always the next node)
+    #   payload  : optional, after padding to 8 bytes: one value per node from _dump_payload
+    # The shape and colors are stored as they are, so load() needs no rebalancing.
+    _FILE_MAGIC = b'RBT1'
+    _FILE_HEADER = struct.Struct('=4scc2xq')
+    _FLAG_RED = 1
+    _FLAG_LEFT = 2
+
+    def dump(self, path, typecode=None):
+        """Write the tree to path. typecode defaults to 'q' for int elements and 'd' otherwise."""
+        nodes = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node._right is not None:
+                stack.append(node._right)
+            if node._left is not None:
+                stack.append(node._left)
+        elements = [node._element for node in nodes]
+        if typecode is None:
+            typecode = 'q' if all(isinstance(element, int) for element in elements) else 'd'
+        keys = array(typecode, elements)    # TypeError / OverflowError if a key does not fit
+        index = {id(node): i for i, node in enumerate(nodes)}
+        right = array('q', [index[id(node._right)] if node._right is not None else -1 for node in nodes])
+        red = self._Node.RED
+        flags = bytearray((self._FLAG_RED if node._color == red else 0) |
+                          (self._FLAG_LEFT if node._left is not None else 0) for node in nodes)
+        payload = self._dump_payload(nodes, typecode)
+        payload_typecode = payload.typecode.encode() if payload is not None else b'\0'
+        with open(path, 'wb') as f:
+            f.write(self._FILE_HEADER.pack(self._FILE_MAGIC, typecode.encode(), payload_typecode, len(nodes)))
+            keys.tofile(f)
+            f.write(bytes(-len(keys) * keys.itemsize % 8))
+            right.tofile(f)
+            f.write(flags)
+            if payload is not None:
+                f.write(bytes(-len(flags) % 8))
+                payload.tofile(f)
+
+    # Load a tree written by dump().
+    # mmap=True returns a read-only MappedRedBlackTree that searches the file in place,
+    # without creating any _Node; mmap=False rebuilds the _Node objects in O(n).
+    # The mapped view only knows the keys, so classes whose nodes carry more
+    # (those overriding _load_payload) and files with a payload need mmap=False.
+    @classmethod
+    def load(cls, path, mmap=True):
+        if mmap:
+            if cls._load_payload is not RedBlackTree._load_payload:
+                raise TypeError(f'{cls.__name__} snapshots can only be loaded with mmap=False')
+            from mapped_redblack_tree import MappedRedBlackTree
+            return MappedRedBlackTree(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        _, n, keys, right, flags, payload = cls._snapshot_arrays(data)
+        elements = keys.tolist()
+        red = cls._Node.RED
+        black = cls._Node.BLACK
+        node_class = cls._Node
+        is_red = cls._FLAG_RED
+        has_left = cls._FLAG_LEFT
+        nodes = [node_class(element, None, None, None, red if flag & is_red else black)
+                 for element, flag in zip(elements, flags)]
+        for i, r in enumerate(right.tolist()):
+            node = nodes[i]
+            if flags[i] & has_left:
+                child = nodes[i+1]
+                node._left = child
+                child._parent = node
+            if r != -1:
+                child = nodes[r]
+                node._right = child
+                child._parent = node
+        tree = cls()
+        tree._root = nodes[0] if nodes else None
+        tree._size = n
+        tree._load_payload(nodes, payload)
+        return tree
+
+    # Hooks for subclasses whose nodes carry more than the element.
+    # _dump_payload returns one extra value per preorder node as an array (None if
+    # there is nothing to store); _load_payload gets the linked preorder nodes and
+    # that payload (None if the file has none) and fills in the extra fields.
+    def _dump_payload(self, nodes, typecode):
+        return None
+
+    def _load_payload(self, nodes, payload):
+        pass
+
+    @classmethod
+    def _snapshot_arrays(cls, buffer):
+        # Return (typecode, n, elements, right, flags, payload) as memoryviews into buffer;
+        # payload is None when the file has none
+        header = cls._FILE_HEADER
+        if len(buffer) < header.size:
+            raise ValueError('not a red-black tree snapshot')
+        magic, typecode, payload_typecode, n = header.unpack_from(buffer)
+        if magic != cls._FILE_MAGIC:
+            raise ValueError('not a red-black tree snapshot')
+        typecode = typecode.decode()
+        itemsize = array(typecode).itemsize
+        keys_start = header.size
+        right_start = keys_start + n * itemsize + (-n * itemsize) % 8
+        flags_start = right_start + n * 8
+        end = flags_start + n
+        if payload_typecode != b'\0':
+            payload_typecode = payload_typecode.decode()
+            payload_start = end + (-n) % 8
+            end = payload_start + n * array(payload_typecode).itemsize
+        if len(buffer) < end:
+            raise ValueError('truncated red-black tree snapshot')
+        view = memoryview(buffer)
+        payload = None
+        if payload_typecode != b'\0':
+            payload = view[payload_start:end].cast(payload_typecode)
+        return (typecode, n,
+                view[keys_start:keys_start + n * itemsize].cast(typecode),
+                view[right_start:flags_start].cast('q'),
+                view[flags_start:flags_start + n],
+                payload)
 
 
-    
     # BONUS FUNCTIONS -- use them freely if you want
     def is_leaf(self, node):
         if (node._left == None and
@@ -229,7 +827,10 @@ class RedBlackTree():
                     node._parent._color = self._Node.BLACK
                     node._parent._parent._color = self._Node.RED
                     self._rotate_right(node._parent._parent)
+        # A RED root here means the black height of the whole tree grows by one
+        grew = self._root._color == self._Node.RED
         self._root._color = self._Node.BLACK
+        return grew
 
     def _is_black(self, node):
         return node == None or node._color == self._Node.BLACK
@@ -241,6 +842,41 @@ class RedBlackTree():
             successor = successor._left
         return successor
 
+    # Leftmost / rightmost node of the subtree rooted at node
+    def _first_node(self, node):
+        if node is None:
+            return None
+        while node._left is not None:
+            node = node._left
+        return node
+
+    def _last_node(self, node):
+        if node is None:
+            return None
+        while node._right is not None:
+            node = node._right
+        return node
+
+    # Next node in in-order (amortized O(1) over a full traversal)
+    def _next_node(self, node):
+        if node._right is not None:
+            return self._first_node(node._right)
+        parent = node._parent
+        while parent is not None and node is parent._right:
+            node = parent
+            parent = parent._parent
+        return parent
+
+    # Previous node in in-order
+    def _prev_node(self, node):
+        if node._left is not None:
+            return self._last_node(node._left)
+        parent = node._parent
+        while parent is not None and node is parent._left:
+            node = parent
+            parent = parent._parent
+        return parent
+
     def _sibling(self, node):
         # Get sibling
         parent = node._parent
@@ -283,43 +919,131 @@ class RedBlackTree():
     #------------------------------------------
 
     # Supporting functions -- DO NOT MODIFY BELOW
-    def display(self):
-        print('--------------')
-        self._display(self._root, 0)
-        print('--------------')
+    def display(self, max_depth=None, stream=None):
+        # max_depth: deeper subtrees are shown as '...', stream: where to write (default stdout)
+        if stream is None:
+            stream = sys.stdout
+        stream.write('--------------\n')
+        self._display(self._root, 0, max_depth, stream)
+        stream.write('--------------\n')
 
-    def _display(self, node, depth):
-        if node == None:
-            return
+    def _display(self, node, depth, max_depth=None, stream=None):
+        # Reverse in-order (right, node, left) with an explicit stack
+        if stream is None:
+            stream = sys.stdout
+        stack = [(node, depth, False)]
+        while stack:
+            node, depth, visited = stack.pop()
+            if node == None:
+                continue
+            if max_depth is not None and depth > max_depth:
+                stream.write(f'{"    "*depth}...\n')
+                continue
 
-        if node._right != None:
-            if node._right._parent != node:
-                print("parent-child error - ", node._element, node._right._element)
-            self._display(node._right, depth+1)
+            if not visited:
+                # left is printed last, so it is pushed first
+                if node._left != None:
+                    stack.append((node._left, depth+1, False))
+                stack.append((node, depth, True))
+                if node._right != None:
+                    if node._right._parent != node:
+                        stream.write(f'parent-child error -  {node._element} {node._right._element}\n')
+                    stack.append((node._right, depth+1, False))
+                continue
 
-        if node == self._root:
-            symbol = '>'
-        else:
-            symbol = '*'
+            if node == self._root:
+                symbol = '>'
+            else:
+                symbol = '*'
 
-        if node._color == self._Node.RED:
-            colorstr = 'R'
-        else:
-            colorstr = 'B'
-        print(f'{"    "*depth}{symbol} {node._element}({colorstr})')
-        if node._left != None:
-            if node._left._parent != node:
-                print("parent error - ", node._element, node._left._element)
-            self._display(node._left, depth+1)
+            if node._color == self._Node.RED:
+                colorstr = 'R'
+            else:
+                colorstr = 'B'
+            stream.write(f'{"    "*depth}{symbol} {node._element}({colorstr})\n')
+            if node._left != None and node._left._parent != node:
+                stream.write(f'parent error -  {node._element} {node._left._element}\n')
 
     def inorder_traverse(self):
         return self._inorder_traverse(self._root)
 
     def _inorder_traverse(self, node):
-        if node == None:
-            return []
-        else:
-            return self._inorder_traverse(node._left) + [node._element] + self._inorder_traverse(node._right)
+        # Single pass with an explicit stack (no list concatenation, no recursion)
+        result = []
+        stack = []
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node._left
+            else:
+                node = stack.pop()
+                result.append(node._element)
+                node = node._right
+        return result
+
+    # Check all five properties (parent-child link, binary search tree order, root black,
+    # no double red, equal black height) in one iterative O(n) walk, without printing.
+    # Returns a dict: valid, size, height, black_height and a list of
+    # (property, element, detail) errors, which stops growing at max_errors.
+    def validate(self, max_errors=10):
+        report = {'valid': True, 'size': 0, 'height': 0, 'black_height': 0, 'errors': []}
+        errors = report['errors']
+        root = self._root
+        if root is None:
+            return report
+        if root._parent is not None:
+            errors.append(('parent-child link', root._element, 'root has a parent'))
+        if root._color != self._Node.BLACK:
+            errors.append(('root black', root._element, 'root is RED'))
+
+        RED = self._Node.RED
+        size = 0
+        height = 0
+        # post-order with an explicit stack; black heights of finished subtrees go to `heights`
+        stack = [(root, 1, None, None, False)]
+        heights = []
+        while stack and len(errors) < max_errors:
+            node, depth, lo, hi, visited = stack.pop()
+            element = node._element
+            left = node._left
+            right = node._right
+            if visited:
+                right_height = heights.pop() if right is not None else 1
+                left_height = heights.pop() if left is not None else 1
+                if left_height != right_height:
+                    errors.append(('black height', element, (left_height, right_height)))
+                if node._color == RED:
+                    heights.append(max(left_height, right_height))
+                else:
+                    heights.append(max(left_height, right_height) + 1)
+                continue
+
+            size += 1
+            if depth > height:
+                height = depth
+            if (lo is not None and element < lo) or (hi is not None and element > hi):
+                errors.append(('binary search tree', element, (lo, hi)))
+            stack.append((node, depth, lo, hi, True))
+            if right is not None:
+                if right._parent is not node:
+                    errors.append(('parent-child link', element, right._element))
+                if node._color == RED and right._color == RED:
+                    errors.append(('double red', element, right._element))
+                stack.append((right, depth+1, element, hi, False))
+            if left is not None:
+                if left._parent is not node:
+                    errors.append(('parent-child link', element, left._element))
+                if node._color == RED and left._color == RED:
+                    errors.append(('double red', element, left._element))
+                stack.append((left, depth+1, lo, element, False))
+
+        del errors[max_errors:]
+        report['valid'] = not errors
+        report['size'] = size
+        report['height'] = height
+        if not stack:
+            report['black_height'] = heights.pop()
+        return report
 
     def check_tree_property_silent(self):
         if self._root == None:
@@ -0,0 +1,172 @@
+from collections.abc import MutableMapping
+
+from redblack_tree import RedBlackTree
+
+class RedBlackTreeMap(RedBlackTree, MutableMapping):
+    """Sorted map implemented with a red-black tree.
+
+    Each node keeps its key in _element and its value in a separate _value slot,
+    so no (key, value) tuples are created or compared.
+    """
+
+    class _Node(RedBlackTree._Node):
+        """Node with an extra slot for the value."""
+        __slots__ = '_value',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED, value=None):
+            super().__init__(element, parent, left, right, color)
+            self._value = value
+
+    #-------------------------- map constructors --------------------------
+    # Build a map from (key, value) pairs sorted by strictly increasing key, in O(n)
+    @classmethod
+    def from_sorted(cls, items):
+        tree = cls()
+        items = list(items)
+        for i in range(1, len(items)):
+            if not items[i-1][0] < items[i][0]:
+                raise ValueError('keys must be sorted and unique')
+        tree._build_from_sorted(items)
+        return tree
+
+    # Insert many (key, value) pairs at once; later pairs win, like dict.update
+    def bulk_insert(self, items):
+        new_items = sorted(dict(items).items(), key=lambda item: item[0])
+        if not new_items:
+            return
+        merged = []
+        i = 0
+        for key, value in self._iter_items():
+            while i < len(new_items) and new_items[i][0] < key:
+                merged.append(new_items[i])
+                i += 1
+            if i < len(new_items) and not key < new_items[i][0]:
+                merged.append(new_items[i])      # same key: the new value replaces the old one
+                i += 1
+            else:
+                merged.append((key, value))
+        merged.extend(new_items[i:])
+        self._build_from_sorted(merged)
+
+    # insert / insert_many take (key, value) pairs and go through __setitem__,
+    # so an existing key is updated in place instead of getting a second node
+    def insert(self, item):
+        key, value = item
+        self[key] = value
+
+    def insert_many(self, items):
+        for key, value in items:
+            self[key] = value
+
+    def _build_subtree(self, elements, lo, hi, parent, depth, red_depth):
+        node = super()._build_subtree(elements, lo, hi, parent, depth, red_depth)
+        if node is not None:
+            node._element, node._value = node._element     # split the (key, value) pair
+        return node
+
+    # Values are arbitrary objects, which the fixed-width snapshot format cannot hold
+    def _dump_payload(self, nodes, typecode):
+        raise TypeError('RedBlackTreeMap cannot be dumped: snapshots only hold the keys')
+
+    def _load_payload(self, nodes, payload):
+        raise TypeError('RedBlackTreeMap cannot be loaded from a snapshot: it only holds the keys')
+
+    #-------------------------- MutableMapping interface --------------------------
+    def __getitem__(self, key):
+        node = self.search(key)
+        if node is None:
+            raise KeyError(key)
+        return node._value
+
+    def __setitem__(self, key, value):
+        parent, node = self._find_slot(key)
+        if node is not None:
+            node._value = value          # existing key: update in place
+        else:
+            self._attach(parent, key, value)
+
+    def __delitem__(self, key):
+        node = self.search(key)
+        if node is None:
+            raise KeyError(key)
+        self._delete_node(node)
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def get(self, key, default=None):
+        node = self.search(key)
+        return node._value if node is not None else default
+
+    def setdefault(self, key, default=None):
+        parent, node = self._find_slot(key)
+        if node is not None:
+            return node._value
+        self._attach(parent, key, default)
+        return default
+
+    def clear(self):
+        self._root = None
+        self._size = 0
+
+    #-------------------------- sorted lookups --------------------------
+    # Each returns a (key, value) pair, or None if there is no such key.
+    def floor(self, key):
+        """Item with the greatest key <= key."""
+        return self._item(self._upper_node(key, True))
+
+    def ceiling(self, key):
+        """Item with the least key >= key."""
+        return self._item(self._lower_node(key, True))
+
+    def predecessor(self, key):
+        """Item with the greatest key strictly less than key."""
+        return self._item(self._upper_node(key, False))
+
+    def successor(self, key):
+        """Item with the least key strictly greater than key."""
+        return self._item(self._lower_node(key, False))
+
+    #-------------------------- nonpublic utilities --------------------------
+    def _item(self, node):
+        return (node._element, node._value) if node is not None else None
+
+    def _iter_items(self):
+        node = self._first_node(self._root)
+        while node is not None:
+            yield node._element, node._value
+            node = self._next_node(node)
+
+    # One descent: return (parent, node) where node holds key, or (parent, None)
+    # where parent is the node the new key has to be attached to.
+    def _find_slot(self, key):
+        parent = None
+        node = self._root
+        while node is not None:
+            if key < node._element:
+                parent, node = node, node._left
+            elif key > node._element:
+                parent, node = node, node._right
+            else:
+                return parent, node
+        return parent, None
+
+    def _attach(self, parent, key, value):
+        node = self._Node(key, parent, value=value)
+        if parent is None:
+            self._root = node
+        elif key < parent._element:
+            parent._left = node
+        else:
+            parent._right = node
+        self._resize(1)
+        self._fix_insert(node)
+
+    def _delete_node(self, node):
+        if node._left is not None and node._right is not None:
+            # Move both key and value of the successor, then remove the successor
+            successor = self._successor(node)
+            node._element = successor._element
+            node._value = successor._value
+            node = successor
+        self._remove_node(node)